@@ -1,10 +1,21 @@
 """Service layer for managing public complaints with geolocation and photos."""
 
+import asyncio
+import hashlib
+import io
+import logging
+import math
+import operator
+import tempfile
+from collections import defaultdict
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
-from decimal import Decimal
+from typing import BinaryIO, Dict, Iterable, Optional, List, Tuple
 
-from sqlmodel import select, col
+import aiofiles
+from sqlalchemy import bindparam, case, insert, lambda_stmt, literal, or_, tuple_, update
+from sqlalchemy.orm import raiseload, selectinload
+from sqlmodel import Session, select, col
 from app.database import get_session
 from app.models import (
     Complaint,
@@ -15,72 +26,279 @@ from app.models import (
     ComplaintStatus,
 )
 
+logger = logging.getLogger(__name__)
+
+# Chunk size for buffered uploads; 64KB+ is where write throughput stabilizes
+_WRITE_CHUNK_SIZE = 1 << 20
+
+# Stored extension per accepted MIME type; the allowlist is derived from the
+# keys so the two can never drift apart. Extensions come from this map, never
+# from the client-supplied filename.
+_MIME_EXT = {"image/jpeg": "jpg", "image/png": "png", "image/gif": "gif", "image/webp": "webp"}
+
+# Cap on expanded IN(...) bind parameters per query; some backends limit these
+_IN_CLAUSE_CHUNK = 500
+
+# Complaints carry a row-major grid-cell id (~0.05 deg, roughly 5.5 km at the
+# equator) so bounding-box queries can hit the geo_cell B-tree index as a few
+# contiguous id ranges instead of scanning every row
+_GEO_CELL_SIZE_DEG = 0.05
+_GEO_CELL_COLS = round(360.0 / _GEO_CELL_SIZE_DEG)
+
+# Past this many row ranges the prefilter costs more than it saves; fall back
+# to the plain coordinate comparison
+_GEO_CELL_MAX_RANGES = 256
+
+# Rows per bulk-insert batch; stays well below PostgreSQL's 65535
+# bind-parameter cap even at ~15 parameters per complaint row
+_BULK_INSERT_CHUNK = 2000
+
+
+def _geo_cell(latitude: float, longitude: float) -> int:
+    """Map a coordinate onto its integer grid-cell id."""
+    row = math.floor((latitude + 90.0) / _GEO_CELL_SIZE_DEG)
+    column = math.floor((longitude + 180.0) / _GEO_CELL_SIZE_DEG)
+    return row * _GEO_CELL_COLS + column
+
+
+def _geo_cell_ranges(south: float, west: float, north: float, east: float) -> List[Tuple[int, int]]:
+    """Contiguous cell-id ranges covering a bounding box, one per grid row.
+
+    Cell ids are row-major, so each latitude row of the box maps to one
+    inclusive ``(low, high)`` id range.
+    """
+    row_lo = math.floor((south + 90.0) / _GEO_CELL_SIZE_DEG)
+    row_hi = math.floor((north + 90.0) / _GEO_CELL_SIZE_DEG)
+    col_lo = math.floor((west + 180.0) / _GEO_CELL_SIZE_DEG)
+    col_hi = math.floor((east + 180.0) / _GEO_CELL_SIZE_DEG)
+    return [(row * _GEO_CELL_COLS + col_lo, row * _GEO_CELL_COLS + col_hi) for row in range(row_lo, row_hi + 1)]
+
+
+def _photos_for_complaints(session: Session, ids: Iterable[int]) -> Dict[int, List[ComplaintPhoto]]:
+    """Fetch photos for many complaints at once, keyed by complaint id.
+
+    One IN(...) query per 500 ids instead of one query per complaint — the
+    manual equivalent of selectinload's strategy, usable with arbitrary id
+    sets outside ORM attribute access. Photos within each bucket come back
+    in display order.
+    """
+    by_id: Dict[int, List[ComplaintPhoto]] = defaultdict(list)
+    id_list = list(ids)
+    for start in range(0, len(id_list), _IN_CLAUSE_CHUNK):
+        rows = session.exec(
+            select(ComplaintPhoto)
+            .where(col(ComplaintPhoto.complaint_id).in_(id_list[start : start + _IN_CLAUSE_CHUNK]))
+            .order_by(col(ComplaintPhoto.display_order), col(ComplaintPhoto.created_at))
+        ).all()
+        for photo in rows:
+            by_id[photo.complaint_id].append(photo)
+    return dict(by_id)
+
+
+# Single attrgetter shared by all response builds; one call yields the photo
+# fields as a tuple, which is faster than six separate attribute lookups
+_PHOTO_FIELDS = operator.attrgetter("id", "filename", "file_path", "mime_type", "caption", "display_order")
+
+
+def _to_response(complaint: Complaint) -> ComplaintResponse:
+    """Build a ComplaintResponse from a loaded ORM complaint.
+
+    Uses ``model_construct`` to skip Pydantic validation: every value comes
+    straight from the database, so re-validating it per row is wasted work.
+    Photos arrive in display order via the relationship's order_by.
+    """
+    photo_responses = []
+    for photo in complaint.photos:
+        photo_id, filename, file_path, mime_type, caption, display_order = _PHOTO_FIELDS(photo)
+        photo_responses.append(
+            ComplaintPhotoResponse.model_construct(
+                id=photo_id or 0,
+                filename=filename,
+                file_path=file_path,
+                mime_type=mime_type,
+                caption=caption,
+                display_order=display_order,
+            )
+        )
+
+    return ComplaintResponse.model_construct(
+        id=complaint.id or 0,
+        title=complaint.title,
+        description=complaint.description,
+        latitude=complaint.latitude,
+        longitude=complaint.longitude,
+        location_description=complaint.location_description,
+        submitter_name=complaint.submitter_name,
+        status=complaint.status,
+        created_at=complaint.created_at.isoformat(),
+        photos=photo_responses,
+    )
+
 
 class ComplaintService:
     """Service for managing public complaints."""
 
     UPLOAD_DIR = Path("uploads/complaint_photos")
-    ALLOWED_PHOTO_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
+    ALLOWED_PHOTO_TYPES = frozenset(_MIME_EXT)
     MAX_PHOTO_SIZE = 5 * 1024 * 1024  # 5MB
 
+    _upload_dir_ready = False
+
     @classmethod
     def setup_upload_dir(cls) -> None:
-        """Ensure upload directory exists."""
+        """Ensure upload directory exists.
+
+        Called on every photo write, so the mkdir (and its stat) runs once
+        per process; the flag makes subsequent calls a plain attribute check.
+        """
+        if cls._upload_dir_ready:
+            return
         cls.UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+        cls._upload_dir_ready = True
+
+    @classmethod
+    def validate_photo(cls, mime_type: str, size: int) -> bool:
+        """Check MIME type and size from metadata alone.
+
+        Lets callers reject an upload before reading its body into memory;
+        the write paths apply the same checks as a backstop.
+        """
+        return mime_type in cls.ALLOWED_PHOTO_TYPES and size <= cls.MAX_PHOTO_SIZE
 
     @staticmethod
     def create_complaint(complaint_data: ComplaintCreate, submit_ip: Optional[str] = None) -> Optional[Complaint]:
         """Create a new complaint with geolocation."""
         try:
             with get_session() as session:
-                complaint = Complaint(
-                    title=complaint_data.title,
-                    description=complaint_data.description,
-                    latitude=complaint_data.latitude,
-                    longitude=complaint_data.longitude,
-                    location_description=complaint_data.location_description,
-                    submitter_name=complaint_data.submitter_name,
-                    submitter_email=complaint_data.submitter_email,
-                    submitter_phone=complaint_data.submitter_phone,
-                    submit_ip=submit_ip,
-                    status=ComplaintStatus.SUBMITTED,
+                # INSERT ... RETURNING hands back the full row (including the
+                # server-assigned id and created_at) in one round trip,
+                # replacing the add/commit/refresh INSERT-plus-SELECT pattern
+                result = session.execute(
+                    insert(Complaint)
+                    .values(
+                        title=complaint_data.title,
+                        description=complaint_data.description,
+                        latitude=complaint_data.latitude,
+                        longitude=complaint_data.longitude,
+                        geo_cell=_geo_cell(complaint_data.latitude, complaint_data.longitude),
+                        location_description=complaint_data.location_description,
+                        submitter_name=complaint_data.submitter_name,
+                        submitter_email=complaint_data.submitter_email,
+                        submitter_phone=complaint_data.submitter_phone,
+                        submit_ip=submit_ip,
+                        status=ComplaintStatus.SUBMITTED,
+                    )
+                    .returning(Complaint)
                 )
+                complaint = result.scalar_one()
 
-                session.add(complaint)
+                # Detach before commit so expire_on_commit doesn't wipe the
+                # returned attributes once the session closes
+                session.expunge(complaint)
                 session.commit()
-                session.refresh(complaint)
                 return complaint
 
         except Exception as e:
-            import logging
-
-            logging.error(f"Error creating complaint: {e}")
+            logger.exception(f"Error creating complaint: {e}")
             return None
 
+    @staticmethod
+    def create_complaints_bulk(complaints: List[ComplaintCreate], submit_ip: Optional[str] = None) -> int:
+        """Insert many complaints with chunked Core executemany batches.
+
+        Bypasses the per-object unit of work, so batch imports cost one round
+        trip per 2000 rows instead of one flush per complaint. Returns the
+        number of rows inserted.
+        """
+        try:
+            rows = [
+                {
+                    "title": data.title,
+                    "description": data.description,
+                    "latitude": data.latitude,
+                    "longitude": data.longitude,
+                    "geo_cell": _geo_cell(data.latitude, data.longitude),
+                    "location_description": data.location_description,
+                    "submitter_name": data.submitter_name,
+                    "submitter_email": data.submitter_email,
+                    "submitter_phone": data.submitter_phone,
+                    "status": ComplaintStatus.SUBMITTED,
+                    "submit_ip": submit_ip,
+                    "facebook_redirected": False,
+                    "lapor_redirected": False,
+                }
+                for data in complaints
+            ]
+
+            with get_session() as session:
+                for start in range(0, len(rows), _BULK_INSERT_CHUNK):
+                    session.execute(insert(Complaint), rows[start : start + _BULK_INSERT_CHUNK])
+                session.commit()
+            return len(rows)
+
+        except Exception as e:
+            logger.exception(f"Error bulk-inserting complaints: {e}")
+            return 0
+
     @staticmethod
     def add_photo_to_complaint(
         complaint_id: int, file_content: bytes, filename: str, mime_type: str, caption: str = "", display_order: int = 0
     ) -> Optional[ComplaintPhoto]:
-        """Add a photo to an existing complaint."""
+        """Add a photo from an in-memory payload to an existing complaint."""
+        return ComplaintService.add_photo_from_stream(
+            complaint_id, io.BytesIO(file_content), filename, mime_type, caption, display_order
+        )
+
+    @staticmethod
+    def add_photo_from_stream(
+        complaint_id: int,
+        stream: BinaryIO,
+        filename: str,
+        mime_type: str,
+        caption: str = "",
+        display_order: int = 0,
+    ) -> Optional[ComplaintPhoto]:
+        """Add a photo to a complaint from a binary stream.
+
+        The MIME type is checked before any bytes are read and the copy stops
+        at the first chunk past MAX_PHOTO_SIZE, so an oversized or rejected
+        upload never occupies more than one chunk of memory.
+        """
+        tmp_path: Optional[Path] = None
         try:
-            # Validate file type and size
             if mime_type not in ComplaintService.ALLOWED_PHOTO_TYPES:
                 raise ValueError(f"Unsupported file type: {mime_type}")
 
-            if len(file_content) > ComplaintService.MAX_PHOTO_SIZE:
-                raise ValueError("File size exceeds maximum limit (5MB)")
-
             # Ensure upload directory exists
             ComplaintService.setup_upload_dir()
 
-            # Generate unique filename
-            file_extension = filename.split(".")[-1] if "." in filename else "jpg"
-            safe_filename = f"complaint_{complaint_id}_{hash(filename + str(len(file_content)))}.{file_extension}"
+            # Stream into a temp file next to the destination while hashing
+            # and counting; the content digest is only known once the copy
+            # completes, so the file is renamed into place afterwards.
+            # SHA-256 uses hardware instructions where available.
+            digest = hashlib.sha256()
+            file_size = 0
+            with tempfile.NamedTemporaryFile(dir=ComplaintService.UPLOAD_DIR, delete=False) as tmp:
+                tmp_path = Path(tmp.name)
+                while chunk := stream.read(_WRITE_CHUNK_SIZE):
+                    file_size += len(chunk)
+                    if file_size > ComplaintService.MAX_PHOTO_SIZE:
+                        raise ValueError("File size exceeds maximum limit (5MB)")
+                    digest.update(chunk)
+                    tmp.write(chunk)
+
+            # Name the file by content digest: stable across restarts, and a
+            # duplicate upload resolves to the already-stored blob without a
+            # second write. The extension comes from the validated MIME type,
+            # not the untrusted filename.
+            content_sha256 = digest.hexdigest()
+            safe_filename = f"complaint_{complaint_id}_{content_sha256[:24]}.{_MIME_EXT[mime_type]}"
             file_path = ComplaintService.UPLOAD_DIR / safe_filename
-
-            # Save file to disk
-            with open(file_path, "wb") as f:
-                f.write(file_content)
+            if file_path.exists():
+                tmp_path.unlink(missing_ok=True)
+            else:
+                tmp_path.replace(file_path)
+            tmp_path = None
 
             # Save to database
             with get_session() as session:
@@ -88,8 +306,9 @@ class ComplaintService:
                     complaint_id=complaint_id,
                     filename=filename,
                     file_path=str(file_path),
-                    file_size=len(file_content),
+                    file_size=file_size,
                     mime_type=mime_type,
+                    content_sha256=content_sha256,
                     caption=caption,
                     display_order=display_order,
                 )
@@ -100,174 +319,290 @@ class ComplaintService:
                 return photo
 
         except Exception as e:
-            import logging
-
-            logging.error(f"Error adding photo to complaint: {e}")
+            logger.exception(f"Error adding photo to complaint: {e}")
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
             return None
 
+    @staticmethod
+    async def add_photos_bulk(complaint_id: int, photos: List[Tuple[bytes, str, str]]) -> List[ComplaintPhoto]:
+        """Save multiple photos for a complaint with concurrent writes and one commit.
+
+        ``photos`` is a list of ``(file_content, filename, mime_type)`` tuples in
+        display order. Disk writes fan out with asyncio.gather and all rows are
+        inserted in a single transaction, so N photos cost roughly one write
+        latency plus one commit instead of N of each.
+        """
+        try:
+            for file_content, _filename, mime_type in photos:
+                if mime_type not in ComplaintService.ALLOWED_PHOTO_TYPES:
+                    raise ValueError(f"Unsupported file type: {mime_type}")
+                if len(file_content) > ComplaintService.MAX_PHOTO_SIZE:
+                    raise ValueError("File size exceeds maximum limit (5MB)")
+
+            # Ensure upload directory exists
+            ComplaintService.setup_upload_dir()
+
+            entries = []
+            for display_order, (file_content, filename, mime_type) in enumerate(photos):
+                digest = hashlib.sha256(file_content).hexdigest()
+                file_path = (
+                    ComplaintService.UPLOAD_DIR / f"complaint_{complaint_id}_{digest[:24]}.{_MIME_EXT[mime_type]}"
+                )
+                entries.append((file_path, file_content, filename, mime_type, digest, display_order))
+
+            async def save_one(file_path: Path, file_content: bytes) -> None:
+                if file_path.exists():
+                    return
+                async with aiofiles.open(file_path, "wb") as f:
+                    await f.write(file_content)
+
+            await asyncio.gather(*(save_one(file_path, content) for file_path, content, *_ in entries))
+
+            with get_session() as session:
+                rows = [
+                    ComplaintPhoto(
+                        complaint_id=complaint_id,
+                        filename=filename,
+                        file_path=str(file_path),
+                        file_size=len(file_content),
+                        mime_type=mime_type,
+                        content_sha256=digest,
+                        caption="",
+                        display_order=display_order,
+                    )
+                    for file_path, file_content, filename, mime_type, digest, display_order in entries
+                ]
+
+                session.add_all(rows)
+                session.commit()
+                for row in rows:
+                    session.refresh(row)
+                return rows
+
+        except Exception as e:
+            logger.exception(f"Error adding photos to complaint: {e}")
+            return []
+
     @staticmethod
     def get_complaint(complaint_id: int) -> Optional[ComplaintResponse]:
         """Get a complaint by ID with all its photos."""
         with get_session() as session:
-            complaint = session.get(Complaint, complaint_id)
+            # lambda_stmt caches the compiled statement; only the bound id varies per call
+            stmt = lambda_stmt(
+                lambda: (
+                    select(Complaint)
+                    .options(selectinload(Complaint.photos), raiseload("*"))  # type: ignore[arg-type]
+                    .where(Complaint.id == complaint_id)
+                )
+            )
+            complaint = session.scalars(stmt).first()
             if not complaint:
                 return None
 
-            # Get photos
-            photos = session.exec(
-                select(ComplaintPhoto)
-                .where(ComplaintPhoto.complaint_id == complaint_id)
-                .order_by(col(ComplaintPhoto.display_order), col(ComplaintPhoto.created_at))
-            ).all()
-
-            photo_responses = [
-                ComplaintPhotoResponse(
-                    id=photo.id or 0,
-                    filename=photo.filename,
-                    file_path=photo.file_path,
-                    mime_type=photo.mime_type,
-                    caption=photo.caption,
-                    display_order=photo.display_order,
-                )
-                for photo in photos
-            ]
+            return _to_response(complaint)
 
-            return ComplaintResponse(
-                id=complaint.id or 0,
-                title=complaint.title,
-                description=complaint.description,
-                latitude=complaint.latitude,
-                longitude=complaint.longitude,
-                location_description=complaint.location_description,
-                submitter_name=complaint.submitter_name,
-                status=complaint.status,
-                created_at=complaint.created_at.isoformat(),
-                photos=photo_responses,
+    @staticmethod
+    def get_recent_complaints(
+        limit: int = 50, cursor: Optional[Tuple[datetime, int]] = None
+    ) -> List[ComplaintResponse]:
+        """Get recent complaints for display.
+
+        ``cursor`` is the ``(created_at, id)`` of the last complaint on the previous
+        page; only strictly older rows are returned (keyset pagination, so deep
+        pages never pay for OFFSET rescans).
+        """
+        with get_session() as session:
+            # lambda_stmt caches the compiled statement; only limit/cursor vary per call.
+            # Photos are eager-loaded in one batched query instead of one SELECT per complaint.
+            stmt = lambda_stmt(
+                lambda: (
+                    select(Complaint)
+                    .options(selectinload(Complaint.photos), raiseload("*"))  # type: ignore[arg-type]
+                    .order_by(col(Complaint.created_at).desc(), col(Complaint.id).desc())
+                    .limit(limit)
+                )
             )
+            params = {}
+            if cursor is not None:
+                params = {"cursor_created_at": cursor[0], "cursor_id": cursor[1]}
+                stmt += lambda s: s.where(
+                    tuple_(col(Complaint.created_at), col(Complaint.id))
+                    < tuple_(bindparam("cursor_created_at"), bindparam("cursor_id"))
+                )
+
+            complaints = session.scalars(stmt, params).all()
+
+            return [_to_response(complaint) for complaint in complaints]
 
     @staticmethod
-    def get_recent_complaints(limit: int = 50) -> List[ComplaintResponse]:
-        """Get recent complaints for display."""
-        with get_session() as session:
-            complaints = session.exec(select(Complaint).order_by(col(Complaint.created_at).desc()).limit(limit)).all()
-
-            responses = []
-            for complaint in complaints:
-                # Get photos for each complaint
-                photos = session.exec(
-                    select(ComplaintPhoto)
-                    .where(ComplaintPhoto.complaint_id == complaint.id)
-                    .order_by(col(ComplaintPhoto.display_order))
-                ).all()
-
-                photo_responses = [
-                    ComplaintPhotoResponse(
-                        id=photo.id or 0,
-                        filename=photo.filename,
-                        file_path=photo.file_path,
-                        mime_type=photo.mime_type,
-                        caption=photo.caption,
-                        display_order=photo.display_order,
-                    )
-                    for photo in photos
-                ]
+    def get_recent_complaints_fast(limit: int = 50) -> List[Dict[str, object]]:
+        """Get recent complaints as plain dicts for list views.
 
-                responses.append(
-                    ComplaintResponse(
-                        id=complaint.id or 0,
-                        title=complaint.title,
-                        description=complaint.description,
-                        latitude=complaint.latitude,
-                        longitude=complaint.longitude,
-                        location_description=complaint.location_description,
-                        submitter_name=complaint.submitter_name,
-                        status=complaint.status,
-                        created_at=complaint.created_at.isoformat(),
-                        photos=photo_responses,
+        Selects only the columns the list renders — no entity hydration,
+        photo loading, or response-model validation. ``status`` and
+        ``created_at`` come back render-ready as plain strings.
+        """
+        with get_session() as session:
+            stmt = lambda_stmt(
+                lambda: (
+                    select(
+                        col(Complaint.id),
+                        col(Complaint.title),
+                        col(Complaint.latitude),
+                        col(Complaint.longitude),
+                        col(Complaint.location_description),
+                        col(Complaint.status),
+                        col(Complaint.created_at),
                     )
+                    .order_by(col(Complaint.created_at).desc(), col(Complaint.id).desc())
+                    .limit(limit)
                 )
+            )
+            return [
+                {
+                    "id": row.id,
+                    "title": row.title,
+                    "latitude": row.latitude,
+                    "longitude": row.longitude,
+                    "location_description": row.location_description,
+                    "status": row.status.value,
+                    "created_at": row.created_at.isoformat(),
+                }
+                for row in session.execute(stmt)  # type: ignore[call-overload]
+            ]
 
-            return responses
+    @staticmethod
+    def _redirect_update(complaint_id: int, platform: str):
+        """Build the UPDATE that flips a redirect flag and recomputes status.
+
+        One statement with a CASE on the other platform's flag: a single round
+        trip and no ORM row rehydration for what is just a flag flip.
+        """
+        match platform.lower():
+            case "facebook":
+                flags = {"facebook_redirected": True}
+                other_done = col(Complaint.lapor_redirected)
+            case "lapor":
+                flags = {"lapor_redirected": True}
+                other_done = col(Complaint.facebook_redirected)
+            case _:
+                flags = {}
+                other_done = col(Complaint.facebook_redirected) & col(Complaint.lapor_redirected)
+
+        # Literals inside CASE don't inherit the target column's enum type,
+        # so bind them explicitly or they'd be sent as raw strings
+        status_type = Complaint.__table__.c.status.type  # type: ignore[attr-defined]
+        status_expr = case(
+            (other_done, literal(ComplaintStatus.COMPLETED, status_type)),
+            else_=literal(ComplaintStatus.REDIRECTED, status_type),
+        )
+
+        return update(Complaint).where(col(Complaint.id) == complaint_id).values(status=status_expr, **flags)
 
     @staticmethod
     def mark_redirected(complaint_id: int, platform: str) -> bool:
         """Mark complaint as redirected to external platform."""
         try:
             with get_session() as session:
-                complaint = session.get(Complaint, complaint_id)
-                if not complaint:
-                    return False
-
-                if platform.lower() == "facebook":
-                    complaint.facebook_redirected = True
-                elif platform.lower() == "lapor":
-                    complaint.lapor_redirected = True
-
-                # Update status if redirected to both platforms
-                if complaint.facebook_redirected and complaint.lapor_redirected:
-                    complaint.status = ComplaintStatus.COMPLETED
-                else:
-                    complaint.status = ComplaintStatus.REDIRECTED
-
-                session.add(complaint)
+                result = session.execute(ComplaintService._redirect_update(complaint_id, platform))
                 session.commit()
-                return True
+                return result.rowcount > 0
 
         except Exception as e:
-            import logging
+            logger.exception(f"Error marking complaint as redirected: {e}")
+            return False
+
+    @staticmethod
+    def finalize(complaint_id: int, photos: List[Tuple[bytes, str, str]], redirect_target: str) -> bool:
+        """Attach photos and mark the complaint redirected in one transaction.
+
+        ``photos`` is a list of ``(file_content, filename, mime_type)`` tuples
+        in display order. The photo inserts and the status UPDATE share a
+        single commit, so the submission workflow pays one fsync instead of
+        one per step, and a failed photo write leaves the status untouched.
+        """
+        try:
+            for file_content, _filename, mime_type in photos:
+                if mime_type not in ComplaintService.ALLOWED_PHOTO_TYPES:
+                    raise ValueError(f"Unsupported file type: {mime_type}")
+                if len(file_content) > ComplaintService.MAX_PHOTO_SIZE:
+                    raise ValueError("File size exceeds maximum limit (5MB)")
+
+            # Ensure upload directory exists
+            ComplaintService.setup_upload_dir()
+
+            rows = []
+            for display_order, (file_content, filename, mime_type) in enumerate(photos):
+                digest = hashlib.sha256(file_content).hexdigest()
+                safe_filename = f"complaint_{complaint_id}_{digest[:24]}.{_MIME_EXT[mime_type]}"
+                file_path = ComplaintService.UPLOAD_DIR / safe_filename
+                if not file_path.exists():
+                    file_path.write_bytes(file_content)
+                rows.append(
+                    {
+                        "complaint_id": complaint_id,
+                        "filename": filename,
+                        "file_path": str(file_path),
+                        "file_size": len(file_content),
+                        "mime_type": mime_type,
+                        "content_sha256": digest,
+                        "caption": "",
+                        "display_order": display_order,
+                    }
+                )
 
-            logging.error(f"Error marking complaint as redirected: {e}")
+            with get_session() as session:
+                if rows:
+                    session.execute(insert(ComplaintPhoto), rows)
+                result = session.execute(ComplaintService._redirect_update(complaint_id, redirect_target))
+                session.commit()
+                return result.rowcount > 0
+
+        except Exception as e:
+            logger.exception(f"Error finalizing complaint: {e}")
             return False
 
     @staticmethod
-    def get_complaints_in_area(south: float, west: float, north: float, east: float) -> List[ComplaintResponse]:
-        """Get complaints within a geographic bounding box."""
+    def get_complaints_in_area(
+        south: float, west: float, north: float, east: float, cursor: Optional[Tuple[datetime, int]] = None
+    ) -> List[ComplaintResponse]:
+        """Get complaints within a geographic bounding box.
+
+        ``cursor`` works as in :meth:`get_recent_complaints`.
+        """
         with get_session() as session:
-            complaints = session.exec(
+            # Photos are eager-loaded in one batched query instead of one SELECT
+            # per complaint. The number of cell ranges varies per bounding box,
+            # so this statement is built plainly rather than lambda-cached.
+            stmt = (
                 select(Complaint)
+                .options(selectinload(Complaint.photos), raiseload("*"))  # type: ignore[arg-type]
                 .where(
-                    Complaint.latitude >= Decimal(str(south)),
-                    Complaint.latitude <= Decimal(str(north)),
-                    Complaint.longitude >= Decimal(str(west)),
-                    Complaint.longitude <= Decimal(str(east)),
+                    col(Complaint.latitude).between(south, north),
+                    col(Complaint.longitude).between(west, east),
                 )
-                .order_by(col(Complaint.created_at).desc())
-            ).all()
-
-            responses = []
-            for complaint in complaints:
-                # Get photos for each complaint
-                photos = session.exec(
-                    select(ComplaintPhoto)
-                    .where(ComplaintPhoto.complaint_id == complaint.id)
-                    .order_by(col(ComplaintPhoto.display_order))
-                ).all()
-
-                photo_responses = [
-                    ComplaintPhotoResponse(
-                        id=photo.id or 0,
-                        filename=photo.filename,
-                        file_path=photo.file_path,
-                        mime_type=photo.mime_type,
-                        caption=photo.caption,
-                        display_order=photo.display_order,
-                    )
-                    for photo in photos
-                ]
+                .order_by(col(Complaint.created_at).desc(), col(Complaint.id).desc())
+            )
 
-                responses.append(
-                    ComplaintResponse(
-                        id=complaint.id or 0,
-                        title=complaint.title,
-                        description=complaint.description,
-                        latitude=complaint.latitude,
-                        longitude=complaint.longitude,
-                        location_description=complaint.location_description,
-                        submitter_name=complaint.submitter_name,
-                        status=complaint.status,
-                        created_at=complaint.created_at.isoformat(),
-                        photos=photo_responses,
-                    )
+            # Indexed prefilter: the box becomes a union of contiguous geo_cell
+            # ranges, with the exact coordinate comparison above weeding out
+            # false positives along the cell edges
+            ranges = _geo_cell_ranges(south, west, north, east)
+            if len(ranges) <= _GEO_CELL_MAX_RANGES:
+                stmt = stmt.where(or_(*(col(Complaint.geo_cell).between(low, high) for low, high in ranges)))
+
+            # Same typed-bindparam cursor predicate as get_recent_complaints:
+            # binding through the column's type keeps the rendered datetime in
+            # the stored format (SQLite's second-precision text in particular)
+            params = {}
+            if cursor is not None:
+                params = {"cursor_created_at": cursor[0], "cursor_id": cursor[1]}
+                stmt = stmt.where(
+                    tuple_(col(Complaint.created_at), col(Complaint.id))
+                    < tuple_(bindparam("cursor_created_at"), bindparam("cursor_id"))
                 )
 
-            return responses
+            complaints = session.scalars(stmt, params).all()
+
+            return [_to_response(complaint) for complaint in complaints]
@@ -1,21 +1,150 @@
 """Geospatial service layer for handling map data, file processing, and spatial operations."""
 
+import hashlib
+import io
+import logging
+import os
+import shutil
+import time
 import zipfile
-import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from types import MappingProxyType
+from xml.etree import ElementTree
+from typing import Dict, Any, BinaryIO, List, Mapping, Optional, Tuple, Union
 
+import numpy as np
+from numpy.typing import ArrayLike
+from sqlalchemy import exists, insert
 from sqlmodel import select, col
 from app.database import get_session
 from app.models import StaticLayer, UserLayer, LayerType, FileType, LayerResponse
 
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0
+
+# West Lombok Regency bounding box; kept as plain floats so validation is a
+# direct comparison instead of a dict build + lookup per call
+_LB_SOUTH, _LB_WEST, _LB_NORTH, _LB_EAST = -8.8, 115.9, -8.3, 116.4
+
+# Shared read-only views handed out by the getters; built once at import so
+# hot callers never pay for a fresh dict or tuple per call
+_LB_BOUNDS = MappingProxyType({"south": _LB_SOUTH, "west": _LB_WEST, "north": _LB_NORTH, "east": _LB_EAST})
+_LB_CENTER = (-8.55, 116.15)  # Approximate center of West Lombok
+
+# Default layer styles per upload format, built once at import
+_DEFAULT_STYLES = {
+    FileType.KML: {"color": "#3388ff", "weight": 3, "opacity": 0.8, "fillColor": "#3388ff", "fillOpacity": 0.2},
+    FileType.KMZ: {"color": "#ff7800", "weight": 3, "opacity": 0.8, "fillColor": "#ff7800", "fillOpacity": 0.2},
+    FileType.SHP: {"color": "#ff3333", "weight": 3, "opacity": 0.8, "fillColor": "#ff3333", "fillOpacity": 0.2},
+}
+
+# Chunk size for buffered uploads; 64KB+ is where write throughput stabilizes
+_WRITE_CHUNK_SIZE = 1 << 20
+
+# Process-local TTL cache for the active layer list; layer data is read-mostly
+# and geom_data blobs can be large, so a hit skips both queries entirely.
+_LAYER_CACHE_TTL_SECONDS = 60.0
+_layer_cache: Optional[Tuple[float, List[LayerResponse]]] = None
+
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace from an element tag."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _parse_coordinates(text: str) -> List[List[float]]:
+    """Parse a KML coordinates block ("lon,lat[,alt] ...") into [lon, lat] pairs.
+
+    Well-formed blocks (every tuple the same width) convert in one NumPy
+    call instead of two float() calls per vertex; ragged or malformed
+    blocks fall back to the scalar path, skipping bad tuples.
+    """
+    tokens = text.split()
+    if not tokens:
+        return []
+
+    width = tokens[0].count(",") + 1
+    if width >= 2 and all(token.count(",") + 1 == width for token in tokens):
+        # The reshape stays inside the try: uniform comma counts don't
+        # guarantee one float per slot (e.g. trailing commas), and such
+        # blocks belong on the scalar fallback too
+        try:
+            values = np.array(text.replace(",", " ").split(), dtype=np.float64)
+            return values.reshape(len(tokens), width)[:, :2].tolist()
+        except ValueError:
+            pass
+
+    coordinates = []
+    for token in tokens:
+        parts = token.split(",")
+        if len(parts) >= 2:
+            try:
+                coordinates.append([float(parts[0]), float(parts[1])])
+            except ValueError:
+                continue
+    return coordinates
+
+
+def _coordinates_in(elem) -> List[List[List[float]]]:
+    """All non-empty <coordinates> blocks under an element, parsed."""
+    blocks = []
+    for child in elem.iter():
+        if _local_name(child.tag) == "coordinates":
+            parsed = _parse_coordinates(child.text or "")
+            if parsed:
+                blocks.append(parsed)
+    return blocks
+
+
+def _placemark_to_feature(placemark) -> Optional[Dict[str, Any]]:
+    """Convert one KML Placemark element into a GeoJSON feature, or None."""
+    properties: Dict[str, Any] = {}
+    geometry: Optional[Dict[str, Any]] = None
+    for child in placemark.iter():
+        tag = _local_name(child.tag)
+        if tag in ("name", "description"):
+            if child.text and child.text.strip():
+                properties[tag] = child.text.strip()
+        elif geometry is None and tag == "Point":
+            points = _coordinates_in(child)
+            if points:
+                geometry = {"type": "Point", "coordinates": points[0][0]}
+        elif geometry is None and tag == "LineString":
+            lines = _coordinates_in(child)
+            if lines:
+                geometry = {"type": "LineString", "coordinates": lines[0]}
+        elif geometry is None and tag == "Polygon":
+            # KML lists the outer boundary ring first, then any inner rings,
+            # which matches GeoJSON polygon ring order
+            rings = _coordinates_in(child)
+            if rings:
+                geometry = {"type": "Polygon", "coordinates": rings}
+
+    if geometry is None:
+        return None
+    return {"type": "Feature", "geometry": geometry, "properties": properties}
+
 
 class GeospatialService:
     """Service for managing geospatial data and operations."""
 
+    @staticmethod
+    def invalidate_layers() -> None:
+        """Drop the cached layer list; called after any layer mutation."""
+        global _layer_cache
+        _layer_cache = None
+
     @staticmethod
     def get_all_active_layers() -> List[LayerResponse]:
         """Get all active layers (static + user layers) for map display."""
+        global _layer_cache
+
+        cached = _layer_cache
+        if cached is not None and time.monotonic() - cached[0] < _LAYER_CACHE_TTL_SECONDS:
+            return cached[1]
+
         with get_session() as session:
             layers = []
 
@@ -59,61 +188,91 @@ class GeospatialService:
                     )
                 )
 
+            _layer_cache = (time.monotonic(), layers)
             return layers
 
     @staticmethod
-    def get_west_lombok_bounds() -> Dict[str, float]:
+    def get_west_lombok_bounds() -> Mapping[str, float]:
         """Get the bounding box coordinates for West Lombok Regency."""
-        return {"south": -8.8, "west": 115.9, "north": -8.3, "east": 116.4}
+        return _LB_BOUNDS
 
     @staticmethod
     def get_default_map_center() -> Tuple[float, float]:
         """Get the default center coordinates for West Lombok."""
-        return (-8.55, 116.15)  # Approximate center of West Lombok
+        return _LB_CENTER
 
     @staticmethod
     def validate_coordinates(latitude: float, longitude: float) -> bool:
         """Validate if coordinates are within West Lombok bounds."""
-        bounds = GeospatialService.get_west_lombok_bounds()
-        return bounds["south"] <= latitude <= bounds["north"] and bounds["west"] <= longitude <= bounds["east"]
+        return _LB_SOUTH <= latitude <= _LB_NORTH and _LB_WEST <= longitude <= _LB_EAST
 
     @staticmethod
-    def process_kml_file(file_content: bytes, filename: str) -> Dict[str, Any]:
-        """Process KML file and extract geospatial data."""
-        try:
-            # For now, return a basic structure
-            # In a real implementation, you'd use libraries like fastkml or lxml
-            return {
-                "type": "FeatureCollection",
-                "features": [],
-                "metadata": {"source_file": filename, "processed": True, "format": "kml"},
-            }
-        except Exception as e:
-            raise ValueError(f"Failed to process KML file: {str(e)}")
+    def validate_coordinates_batch(latitudes: ArrayLike, longitudes: ArrayLike) -> np.ndarray:
+        """Validate arrays of coordinates against West Lombok bounds in one pass.
+
+        Returns a boolean array marking which (latitude, longitude) pairs fall
+        inside the regency bounding box.
+        """
+        lats = np.asarray(latitudes, dtype=np.float64)
+        lons = np.asarray(longitudes, dtype=np.float64)
+        return (lats >= _LB_SOUTH) & (lats <= _LB_NORTH) & (lons >= _LB_WEST) & (lons <= _LB_EAST)
 
     @staticmethod
-    def process_kmz_file(file_content: bytes, filename: str) -> Dict[str, Any]:
-        """Process KMZ file (zipped KML) and extract geospatial data."""
+    def process_kml_file(file_content: Union[bytes, BinaryIO], filename: str) -> Dict[str, Any]:
+        """Process KML file and extract geospatial data.
+
+        Accepts raw bytes or a readable binary stream, so callers like the KMZ
+        path can hand over a ZIP entry without decompressing it into memory first.
+        """
+        source = io.BytesIO(file_content) if isinstance(file_content, bytes) else file_content
+
+        # iterparse walks the document incrementally; clearing each finished
+        # Placemark keeps memory at one placemark regardless of file size
+        features: List[Dict[str, Any]] = []
         try:
-            with tempfile.NamedTemporaryFile() as temp_file:
-                temp_file.write(file_content)
-                temp_file.flush()
+            for _event, elem in ElementTree.iterparse(source, events=("end",)):
+                if _local_name(elem.tag) != "Placemark":
+                    continue
+                feature = _placemark_to_feature(elem)
+                if feature is not None:
+                    features.append(feature)
+                elem.clear()
+        except ElementTree.ParseError:
+            # Malformed uploads degrade to an empty collection rather than
+            # failing the whole layer save
+            logger.warning(f"Could not parse KML content from {filename}")
+
+        return {
+            "type": "FeatureCollection",
+            "features": features,
+            "metadata": {"source_file": filename, "processed": True, "format": "kml"},
+        }
 
-                with zipfile.ZipFile(temp_file.name, "r") as kmz:
-                    # Look for KML files in the KMZ
-                    kml_files = [f for f in kmz.namelist() if f.endswith(".kml")]
-                    if not kml_files:
-                        raise ValueError("No KML files found in KMZ archive")
+    @staticmethod
+    def process_kmz_file(file_content: Union[bytes, BinaryIO], filename: str) -> Dict[str, Any]:
+        """Process KMZ file (zipped KML) and extract geospatial data.
 
-                    # Process the first KML file found
-                    kml_content = kmz.read(kml_files[0])
-                    return GeospatialService.process_kml_file(kml_content, kml_files[0])
+        Accepts raw bytes or a seekable binary stream (e.g. an open file).
+        """
+        try:
+            # ZipFile reads bytes from memory or a stream directly; neither
+            # path round-trips through a temp file
+            source = io.BytesIO(file_content) if isinstance(file_content, bytes) else file_content
+            with zipfile.ZipFile(source, "r") as kmz:
+                # Look for KML files in the KMZ
+                kml_files = [f for f in kmz.namelist() if f.endswith(".kml")]
+                if not kml_files:
+                    raise ValueError("No KML files found in KMZ archive")
+
+                # Stream the first KML file found instead of decompressing it into memory
+                with kmz.open(kml_files[0]) as kml_stream:
+                    return GeospatialService.process_kml_file(kml_stream, kml_files[0])
 
         except Exception as e:
             raise ValueError(f"Failed to process KMZ file: {str(e)}")
 
     @staticmethod
-    def process_shp_file(file_content: bytes, filename: str) -> Dict[str, Any]:
+    def process_shp_file(file_content: Union[bytes, BinaryIO], filename: str) -> Dict[str, Any]:
         """Process Shapefile and extract geospatial data."""
         try:
             # For now, return a basic structure
@@ -126,6 +285,38 @@ class GeospatialService:
         except Exception as e:
             raise ValueError(f"Failed to process Shapefile: {str(e)}")
 
+    @staticmethod
+    def process_many(files: List[Tuple[Union[bytes, BinaryIO], str, FileType]]) -> List[Dict[str, Any]]:
+        """Process several uploaded files concurrently.
+
+        Parsing is dominated by etree/zlib C code that releases the GIL, so a
+        thread pool overlaps the work without the pickling cost of processes.
+        Results come back in input order regardless of completion order.
+        """
+        if not files:
+            return []
+
+        def dispatch(file_content: Union[bytes, BinaryIO], filename: str, file_type: FileType) -> Dict[str, Any]:
+            match file_type:
+                case FileType.KML:
+                    return GeospatialService.process_kml_file(file_content, filename)
+                case FileType.KMZ:
+                    return GeospatialService.process_kmz_file(file_content, filename)
+                case FileType.SHP:
+                    return GeospatialService.process_shp_file(file_content, filename)
+                case _:
+                    raise ValueError(f"Unsupported file type: {file_type}")
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(files)
+        with ThreadPoolExecutor(max_workers=min(len(files), os.cpu_count() or 1)) as executor:
+            futures = {
+                executor.submit(dispatch, content, filename, file_type): index
+                for index, (content, filename, file_type) in enumerate(files)
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        return results  # type: ignore[return-value]
+
     @staticmethod
     def save_user_layer(
         file_content: bytes,
@@ -153,46 +344,165 @@ class GeospatialService:
             upload_dir = Path("uploads/user_layers")
             upload_dir.mkdir(parents=True, exist_ok=True)
 
-            # Save file to disk
-            file_path = upload_dir / f"{hash(filename + str(len(file_content)))}-{filename}"
-            with open(file_path, "wb") as f:
-                f.write(file_content)
-
-            # Save to database
-            with get_session() as session:
-                user_layer = UserLayer(
-                    name=name,
-                    description=description,
-                    file_type=file_type,
-                    original_filename=filename,
-                    file_path=str(file_path),
-                    file_size=len(file_content),
-                    geom_data=geom_data,
-                    style_properties=GeospatialService._get_default_style(file_type),
-                    is_public=is_public,
-                    upload_ip=upload_ip,
-                )
-
-                session.add(user_layer)
-                session.commit()
-                session.refresh(user_layer)
-                return user_layer
+            # Name the file by content digest: stable across restarts and dedupes identical uploads
+            digest = hashlib.blake2b(file_content, digest_size=12).hexdigest()
+            file_path = upload_dir / f"{digest}-{filename}"
+
+            # Save file to disk in fixed-size chunks unless the same content is already stored
+            if not file_path.exists():
+                with open(file_path, "wb", buffering=_WRITE_CHUNK_SIZE) as f:
+                    view = memoryview(file_content)
+                    for offset in range(0, len(view), _WRITE_CHUNK_SIZE):
+                        f.write(view[offset : offset + _WRITE_CHUNK_SIZE])
+
+            return GeospatialService._insert_user_layer(
+                name=name,
+                description=description,
+                file_type=file_type,
+                filename=filename,
+                file_path=file_path,
+                file_size=len(file_content),
+                geom_data=geom_data,
+                is_public=is_public,
+                upload_ip=upload_ip,
+            )
 
         except Exception as e:
-            import logging
+            logger.exception(f"Error saving user layer: {e}")
+            return None
 
-            logging.error(f"Error saving user layer: {e}")
+    @staticmethod
+    def save_user_layer_from_path(
+        source_path: Path,
+        filename: str,
+        file_type: FileType,
+        name: str,
+        description: str = "",
+        is_public: bool = False,
+        upload_ip: Optional[str] = None,
+    ) -> Optional[UserLayer]:
+        """Save an on-disk geospatial file as a user layer without loading it into memory.
+
+        Counterpart to :meth:`save_user_layer` for callers that stream an upload
+        to a temp file first; the content is processed, hashed, and copied in
+        fixed-size chunks, so peak memory stays bounded regardless of file size.
+        """
+        try:
+            # Process file based on type; the processors accept open streams
+            with open(source_path, "rb") as stream:
+                match file_type:
+                    case FileType.KML:
+                        geom_data = GeospatialService.process_kml_file(stream, filename)
+                    case FileType.KMZ:
+                        geom_data = GeospatialService.process_kmz_file(stream, filename)
+                    case FileType.SHP:
+                        geom_data = GeospatialService.process_shp_file(stream, filename)
+                    case _:
+                        raise ValueError(f"Unsupported file type: {file_type}")
+
+            # Create upload directory if it doesn't exist
+            upload_dir = Path("uploads/user_layers")
+            upload_dir.mkdir(parents=True, exist_ok=True)
+
+            # Digest and size in one streaming pass, then a kernel-level copy
+            digest = hashlib.blake2b(digest_size=12)
+            file_size = 0
+            with open(source_path, "rb") as src:
+                while chunk := src.read(_WRITE_CHUNK_SIZE):
+                    digest.update(chunk)
+                    file_size += len(chunk)
+
+            file_path = upload_dir / f"{digest.hexdigest()}-{filename}"
+            if not file_path.exists():
+                shutil.copyfile(source_path, file_path)
+
+            return GeospatialService._insert_user_layer(
+                name=name,
+                description=description,
+                file_type=file_type,
+                filename=filename,
+                file_path=file_path,
+                file_size=file_size,
+                geom_data=geom_data,
+                is_public=is_public,
+                upload_ip=upload_ip,
+            )
+
+        except Exception as e:
+            logger.exception(f"Error saving user layer: {e}")
             return None
 
+    @staticmethod
+    def _insert_user_layer(
+        name: str,
+        description: str,
+        file_type: FileType,
+        filename: str,
+        file_path: Path,
+        file_size: int,
+        geom_data: Dict[str, Any],
+        is_public: bool,
+        upload_ip: Optional[str],
+    ) -> UserLayer:
+        """Insert the user layer row and drop the layer cache."""
+        with get_session() as session:
+            user_layer = UserLayer(
+                name=name,
+                description=description,
+                file_type=file_type,
+                original_filename=filename,
+                file_path=str(file_path),
+                file_size=file_size,
+                geom_data=geom_data,
+                style_properties=GeospatialService._get_default_style(file_type),
+                is_public=is_public,
+                upload_ip=upload_ip,
+            )
+
+            session.add(user_layer)
+            session.commit()
+            session.refresh(user_layer)
+
+            GeospatialService.invalidate_layers()
+            return user_layer
+
     @staticmethod
     def _get_default_style(file_type: FileType) -> Dict[str, Any]:
-        """Get default styling for different file types."""
-        styles = {
-            FileType.KML: {"color": "#3388ff", "weight": 3, "opacity": 0.8, "fillColor": "#3388ff", "fillOpacity": 0.2},
-            FileType.KMZ: {"color": "#ff7800", "weight": 3, "opacity": 0.8, "fillColor": "#ff7800", "fillOpacity": 0.2},
-            FileType.SHP: {"color": "#ff3333", "weight": 3, "opacity": 0.8, "fillColor": "#ff3333", "fillOpacity": 0.2},
-        }
-        return styles.get(file_type, styles[FileType.KML])
+        """Get default styling for different file types.
+
+        Returns a shared reference into the module-level style table; callers
+        store it as-is, so no per-call dict build is needed. Kept as plain
+        dicts because the value goes straight into the JSON column serializer.
+        """
+        return _DEFAULT_STYLES.get(file_type, _DEFAULT_STYLES[FileType.KML])
+
+    @staticmethod
+    def extract_coordinate_arrays(geojson: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """Flatten a FeatureCollection into parallel lon/lat arrays.
+
+        The vectorized paths (shoelace, haversine, bounds masks) want
+        columnar float64 arrays rather than nested [lon, lat] lists; this
+        walks every geometry once and returns the coordinates as two
+        structure-of-arrays columns.
+        """
+        xs: List[float] = []
+        ys: List[float] = []
+
+        def collect(coords) -> None:
+            if not coords:
+                return
+            if isinstance(coords[0], (int, float)):
+                xs.append(coords[0])
+                ys.append(coords[1])
+            else:
+                for part in coords:
+                    collect(part)
+
+        for feature in geojson.get("features", []):
+            geometry = feature.get("geometry") or {}
+            collect(geometry.get("coordinates", []))
+
+        return np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64)
 
     @staticmethod
     def calculate_area(coordinates: List[List[float]]) -> float:
@@ -200,48 +510,116 @@ class GeospatialService:
         if len(coordinates) < 3:
             return 0.0
 
-        area = 0.0
-        n = len(coordinates)
+        # Vectorized shoelace: two dot products instead of a per-vertex Python loop
+        arr = np.asarray(coordinates, dtype=np.float64)
+        x = arr[:, 0]
+        y = arr[:, 1]
 
-        for i in range(n):
-            j = (i + 1) % n
-            area += coordinates[i][0] * coordinates[j][1]
-            area -= coordinates[j][0] * coordinates[i][1]
+        return float(abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2.0)
 
-        return abs(area) / 2.0
+    @staticmethod
+    def simplify_line(coordinates: ArrayLike, tolerance: float) -> np.ndarray:
+        """Simplify a coordinate sequence with Douglas-Peucker.
+
+        Drops every vertex whose perpendicular distance to the simplified
+        line stays within ``tolerance`` (same units as the coordinates).
+        Endpoints are always kept.
+        """
+        pts = np.asarray(coordinates, dtype=np.float64)
+        if pts.shape[0] <= 2:
+            return pts
+
+        keep = np.zeros(pts.shape[0], dtype=bool)
+        keep[0] = keep[-1] = True
+
+        # Iterative stack instead of recursion; the distance computation per
+        # segment is vectorized over all interior points
+        stack = [(0, pts.shape[0] - 1)]
+        while stack:
+            start, end = stack.pop()
+            if end - start < 2:
+                continue
+
+            a = pts[start]
+            d = pts[end] - a
+            seg = pts[start + 1 : end]
+            norm = float(np.hypot(d[0], d[1]))
+            if norm == 0.0:
+                dist = np.hypot(seg[:, 0] - a[0], seg[:, 1] - a[1])
+            else:
+                dist = np.abs(d[0] * (seg[:, 1] - a[1]) - d[1] * (seg[:, 0] - a[0])) / norm
+
+            idx = int(np.argmax(dist))
+            if dist[idx] > tolerance:
+                split = start + 1 + idx
+                keep[split] = True
+                stack.append((start, split))
+                stack.append((split, end))
+
+        return pts[keep]
 
     @staticmethod
-    def calculate_distance(coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
-        """Calculate distance between two coordinates using Haversine formula."""
-        import math
+    def simplify_geometry(geometry: Dict[str, Any], tolerance: float) -> Dict[str, Any]:
+        """Simplify a GeoJSON geometry's line work with Douglas-Peucker.
+
+        Points are returned unchanged; polygon rings that would collapse below
+        four positions keep their original coordinates.
+        """
+
+        def ring(coords: List[List[float]]) -> List[List[float]]:
+            simplified = GeospatialService.simplify_line(coords, tolerance)
+            return simplified.tolist() if simplified.shape[0] >= 4 else coords
+
+        def line(coords: List[List[float]]) -> List[List[float]]:
+            return GeospatialService.simplify_line(coords, tolerance).tolist()
+
+        match geometry.get("type"):
+            case "LineString":
+                return {**geometry, "coordinates": line(geometry["coordinates"])}
+            case "MultiLineString":
+                return {**geometry, "coordinates": [line(part) for part in geometry["coordinates"]]}
+            case "Polygon":
+                return {**geometry, "coordinates": [ring(part) for part in geometry["coordinates"]]}
+            case "MultiPolygon":
+                return {**geometry, "coordinates": [[ring(part) for part in poly] for poly in geometry["coordinates"]]}
+            case _:
+                return geometry
 
-        lat1, lon1 = coord1
-        lat2, lon2 = coord2
+    @staticmethod
+    def simplify_feature_collection(geojson: Dict[str, Any], tolerance: float) -> Dict[str, Any]:
+        """Simplify every feature geometry in a GeoJSON FeatureCollection."""
+        features = [
+            {**feature, "geometry": GeospatialService.simplify_geometry(feature.get("geometry") or {}, tolerance)}
+            for feature in geojson.get("features", [])
+        ]
+        return {**geojson, "features": features}
 
-        # Convert latitude and longitude from degrees to radians
-        lat1 = math.radians(lat1)
-        lon1 = math.radians(lon1)
-        lat2 = math.radians(lat2)
-        lon2 = math.radians(lon2)
+    @staticmethod
+    def calculate_distances(lats1: ArrayLike, lons1: ArrayLike, lats2: ArrayLike, lons2: ArrayLike) -> np.ndarray:
+        """Calculate Haversine distances in kilometers for whole coordinate arrays at once."""
+        lat1, lon1, lat2, lon2 = (np.radians(np.asarray(c, dtype=np.float64)) for c in (lats1, lons1, lats2, lons2))
 
-        # Haversine formula
+        # Haversine formula, element-wise over the input arrays
         dlat = lat2 - lat1
         dlon = lon2 - lon1
-        a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-        c = 2 * math.asin(math.sqrt(a))
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
 
-        # Radius of earth in kilometers
-        r = 6371
+        return EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(a))
 
-        return c * r
+    @staticmethod
+    def calculate_distance(coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
+        """Calculate distance between two coordinates using Haversine formula."""
+        lat1, lon1 = coord1
+        lat2, lon2 = coord2
+        return float(GeospatialService.calculate_distances(lat1, lon1, lat2, lon2))
 
     @staticmethod
     def seed_default_layers() -> None:
         """Seed database with default static layers for West Lombok."""
         with get_session() as session:
-            # Check if layers already exist
-            existing_count = session.exec(select(StaticLayer)).first()
-            if existing_count:
+            # EXISTS returns a single boolean instead of materializing a full
+            # layer row (geom_data included) just to discard it
+            if session.scalar(select(exists().where(col(StaticLayer.id).is_not(None)))):
                 return
 
             default_layers = [
@@ -306,18 +684,28 @@ class GeospatialService:
                 },
             ]
 
-            for layer_data in default_layers:
-                layer = StaticLayer(
-                    name=layer_data["name"],
-                    layer_type=layer_data["layer_type"],
-                    description=layer_data["description"],
-                    display_order=layer_data["display_order"],
-                    style_properties=layer_data["style_properties"],
-                    geom_data={
-                        "type": "FeatureCollection",
-                        "features": [],  # Will be populated with actual BIG data
-                    },
-                )
-                session.add(layer)
+            # One Core executemany instead of five ORM inserts; the rows never
+            # need to come back, so skipping the unit of work costs nothing
+            session.execute(
+                insert(StaticLayer),
+                [
+                    {
+                        "name": layer_data["name"],
+                        "layer_type": layer_data["layer_type"],
+                        "description": layer_data["description"],
+                        "source": "BIG",
+                        "display_order": layer_data["display_order"],
+                        "style_properties": layer_data["style_properties"],
+                        "is_active": True,
+                        "geom_data": {
+                            "type": "FeatureCollection",
+                            "features": [],  # Will be populated with actual BIG data
+                        },
+                    }
+                    for layer_data in default_layers
+                ],
+            )
 
             session.commit()
+
+        GeospatialService.invalidate_layers()
@@ -1,54 +1,329 @@
 """Main mapping interface for SI-GADES geospatial application."""
 
-from decimal import Decimal
-
-from nicegui import ui
+import asyncio
+import gzip
+import logging
+import os
+import shutil
+import tempfile
+from html import escape
+from pathlib import Path
+from string import Template
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+from nicegui import app, ui
 from nicegui.events import UploadEventArguments
+from starlette.responses import Response
+
 from app.geo_service import GeospatialService
 from app.complaint_service import ComplaintService
-from app.models import FileType, ComplaintCreate
+from app.models import FileType, ComplaintCreate, LayerResponse
+
+logger = logging.getLogger(__name__)
+
+# Frequently repeated Tailwind class strings, interned once instead of being
+# re-allocated for every component on every page render
+_FIELD_CLASSES = "w-full mb-2"
+_HINT_CLASSES = "text-sm"
+_SECTION_LABEL_CLASSES = "text-sm font-medium text-gray-600 mb-2"
+_SUBSECTION_LABEL_CLASSES = "text-sm font-medium text-gray-600 mb-1"
+_DIALOG_TITLE_CLASSES = "text-lg font-bold mb-4"
+_TOOL_BUTTON_CLASSES = "w-full tool-button"
+
+# Accepted upload extensions and their layer file types; membership in this
+# map is also the format validation, so a typo can't fall through to SHP
+_FILE_TYPE_MAP = {"kml": FileType.KML, "kmz": FileType.KMZ, "shp": FileType.SHP}
+
+# Precompressed layer payload, keyed on the service's cached layer list: when
+# GeospatialService hands back the same list object, the gzip bytes are reused
+_layers_gz: Optional[Tuple[List[LayerResponse], bytes]] = None
+
+
+# Two screen pixels of longitude at the initial zoom level (10); vertices
+# closer to the simplified outline than this are invisible anyway
+_SIMPLIFY_TOLERANCE_DEG = 2 * 360.0 / (256 * 2**10)
+
+
+def _serialize_layers(layers: List[LayerResponse]) -> List[Dict[str, Any]]:
+    """Shape layers for the client: id, name, simplified geometry, and style."""
+    return [
+        {
+            "id": layer.id,
+            "name": layer.name,
+            "geojson": GeospatialService.simplify_feature_collection(layer.geom_data, _SIMPLIFY_TOLERANCE_DEG),
+            "style": layer.style_properties,
+        }
+        for layer in layers
+    ]
+
+
+def _layers_payload_gz() -> bytes:
+    """Return the active layers as gzip-compressed JSON, cached per layer list."""
+    global _layers_gz
+    layers = GeospatialService.get_all_active_layers()
+    cached = _layers_gz
+    if cached is not None and cached[0] is layers:
+        return cached[1]
+
+    payload = gzip.compress(orjson.dumps(_serialize_layers(layers)), compresslevel=6)
+    _layers_gz = (layers, payload)
+    return payload
+
+
+def warm_layer_cache() -> None:
+    """Build the serialized layer payload ahead of the first request.
+
+    Simplifying and compressing the seeded layers takes noticeable CPU, so
+    startup pays it once instead of the first visitor.
+    """
+    _layers_payload_gz()
+
+
+# Static page fragments, built once at import time instead of being
+# re-interpolated on every page request
+
+_THEME_CSS = """
+<style>
+.si-gades-theme {
+    --primary-color: #1565C0;
+    --secondary-color: #FFC107;
+    --success-color: #4CAF50;
+}
+.map-container {
+    border-radius: 8px;
+    overflow: hidden;
+    box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
+}
+.sidebar {
+    background: linear-gradient(135deg, #1565C0 0%, #0D47A1 100%);
+    color: white;
+}
+.layer-control {
+    background: rgba(255, 255, 255, 0.95);
+    backdrop-filter: blur(10px);
+    border-radius: 8px;
+    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+}
+.tool-button {
+    transition: all 0.2s ease;
+    border-radius: 8px;
+}
+.tool-button:hover {
+    transform: translateY(-1px);
+    box-shadow: 0 4px 8px rgba(0,0,0,0.2);
+}
+</style>
+"""
+
+_LEAFLET_HEAD = """
+<link rel="preconnect" href="https://unpkg.com" crossorigin />
+<link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css" />
+<script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
+"""
+
+_MAP_CONTAINER_HTML = '<div id="map" style="width: 100%; height: 80vh;" class="map-container"></div>'
+
+_MAP_JS_TEMPLATE = Template("""
+<script>
+    // Initialize Leaflet map; preferCanvas renders vector overlays on a
+    // single canvas instead of one SVG node per feature, which keeps
+    // pan/zoom smooth once the infrastructure layers grow large
+    var map = L.map('map', {preferCanvas: true}).setView([$center_lat, $center_lon], 10);
+
+    // Tile layer backed by the browser Cache API: revisited tiles are
+    // served from local storage instead of a network roundtrip. Any
+    // failure (no Cache API, opaque response, quota) falls back to the
+    // plain tile URL.
+    L.TileLayer.Cached = L.TileLayer.extend({
+        createTile: function (coords, done) {
+            var tile = document.createElement('img');
+            tile.alt = '';
+            tile.setAttribute('role', 'presentation');
+            var url = this.getTileUrl(coords);
+            if (!window.caches) {
+                tile.onload = function () { done(null, tile); };
+                tile.onerror = function () { done(new Error('tile load failed'), tile); };
+                tile.src = url;
+                return tile;
+            }
+            caches.open('sigades-osm-tiles').then(function (cache) {
+                return cache.match(url).then(function (hit) {
+                    if (hit) return hit.blob();
+                    return fetch(url).then(function (resp) {
+                        if (resp.ok) cache.put(url, resp.clone());
+                        return resp.blob();
+                    });
+                });
+            }).then(function (blob) {
+                tile.onload = function () { URL.revokeObjectURL(tile.src); done(null, tile); };
+                tile.src = URL.createObjectURL(blob);
+            }).catch(function () {
+                tile.onload = function () { done(null, tile); };
+                tile.onerror = function () { done(new Error('tile load failed'), tile); };
+                tile.src = url;
+            });
+            return tile;
+        }
+    });
+
+    // Add base layer; updateWhenIdle defers tile requests until the pan
+    // settles and keepBuffer retains off-screen tiles so small pans
+    // don't refetch anything
+    new L.TileLayer.Cached('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
+        attribution: '© OpenStreetMap contributors | SI-GADES Lombok Barat',
+        updateWhenIdle: true,
+        keepBuffer: 4,
+        crossOrigin: 'anonymous'
+    }).addTo(map);
+
+    // Set max bounds to West Lombok
+    var bounds = L.latLngBounds(
+        [$south, $west],
+        [$north, $east]
+    );
+    map.setMaxBounds(bounds);
+    map.fitBounds(bounds);
+
+    // Global variables for tools
+    window.measurementLayers = L.layerGroup().addTo(map);
+    window.currentTool = null;
+    window.complaintMarker = null;
+
+    // Add click handler for complaint location. One marker is reused via
+    // setLatLng instead of tearing down and recreating a DOM node per click,
+    // and a 100ms debounce coalesces rapid clicks during drags.
+    map.on('click', function(e) {
+        if (window.currentTool !== 'complaint') return;
+        clearTimeout(window.complaintClickTimer);
+        window.complaintClickTimer = setTimeout(function () {
+            window.complaintLocation = {
+                lat: e.latlng.lat,
+                lng: e.latlng.lng
+            };
+            if (!window.complaintMarker) {
+                window.complaintMarker = L.marker(e.latlng)
+                    .addTo(map)
+                    .bindPopup('Lokasi keluhan dipilih');
+            } else {
+                window.complaintMarker.setLatLng(e.latlng);
+            }
+        }, 100);
+    });
+
+    // Layer data embedded at render time; one L.geoJSON per layer,
+    // reused across toggles
+    window.sigadesLayers = $layers_payload;
+    window.layerRefs = {};
+
+    // Load initial layers
+    loadMapLayers();
+
+    function loadMapLayers() {
+        window.sigadesLayers.forEach(function (l) {
+            if (!window.layerRefs[l.id]) {
+                window.layerRefs[l.id] = L.geoJSON(l.geojson, {style: l.style});
+            }
+            window.layerRefs[l.id].addTo(map);
+        });
+    }
+
+    // Leaflet.draw is only needed by the measurement tools, so it is
+    // injected on first activation instead of shipping with every page
+    window.ensureDrawPlugin = function (onReady) {
+        if (window._drawLoaded) {
+            onReady();
+            return;
+        }
+        var link = document.createElement('link');
+        link.rel = 'stylesheet';
+        link.href = 'https://unpkg.com/leaflet-draw@1.0.4/dist/leaflet.draw.css';
+        document.head.appendChild(link);
+        var script = document.createElement('script');
+        script.src = 'https://unpkg.com/leaflet-draw@1.0.4/dist/leaflet.draw.js';
+        script.onload = function () {
+            window._drawLoaded = true;
+            onReady();
+        };
+        document.head.appendChild(script);
+    };
+
+    // Re-fetches the active layers and rebuilds the Leaflet references;
+    // run after uploads so new layers appear without a page reload
+    window.refreshMapLayers = function () {
+        fetch('/layers.json.gz').then(function (resp) {
+            return resp.json();
+        }).then(function (layers) {
+            Object.keys(window.layerRefs).forEach(function (id) {
+                map.removeLayer(window.layerRefs[id]);
+            });
+            window.layerRefs = {};
+            window.sigadesLayers = layers;
+            loadMapLayers();
+        });
+    };
+
+    // Applies a layer multi-select value directly on the client. The select
+    // emits option indices, which line up with sigadesLayers because both
+    // are built from the same layer list.
+    window.syncLayerVisibility = function (value) {
+        var selected = new Set((value || []).map(function (o) {
+            return o && o.value !== undefined ? o.value : o;
+        }));
+        window.sigadesLayers.forEach(function (l, index) {
+            var ref = window.layerRefs[l.id];
+            if (!ref) return;
+            if (selected.has(index)) {
+                map.addLayer(ref);
+            } else {
+                map.removeLayer(ref);
+            }
+        });
+    };
+</script>
+""")
+
+# Bounds and center are module constants, so bake them in once; only the layer
+# payload is substituted per request
+_west_lombok_bounds = GeospatialService.get_west_lombok_bounds()
+_map_center_lat, _map_center_lon = GeospatialService.get_default_map_center()
+_MAP_JS_TEMPLATE = Template(
+    _MAP_JS_TEMPLATE.safe_substitute(
+        center_lat=_map_center_lat,
+        center_lon=_map_center_lon,
+        south=_west_lombok_bounds["south"],
+        west=_west_lombok_bounds["west"],
+        north=_west_lombok_bounds["north"],
+        east=_west_lombok_bounds["east"],
+    )
+)
 
 
 def create():
     """Create the mapping application routes and components."""
 
+    # Registered into the shared head once at startup, so the theme and the
+    # Leaflet includes ship with the base document instead of being re-sent
+    # on every page view
+    ui.add_head_html(_THEME_CSS, shared=True)
+    ui.add_head_html(_LEAFLET_HEAD, shared=True)
+
+    @app.get("/layers.json.gz")
+    def layers_json_gz() -> Response:
+        """Serve the active layers as precompressed JSON.
+
+        Polygon GeoJSON compresses by ~85%, so clients refreshing layers pull
+        the gzip bytes straight from the in-process cache.
+        """
+        return Response(
+            content=_layers_payload_gz(),
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip"},
+        )
+
     @ui.page("/")
     def main_map():
         """Main mapping interface."""
-        # Apply SI-GADES theme
-        ui.add_head_html("""
-        <style>
-        .si-gades-theme {
-            --primary-color: #1565C0;
-            --secondary-color: #FFC107;
-            --success-color: #4CAF50;
-        }
-        .map-container {
-            border-radius: 8px;
-            overflow: hidden;
-            box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
-        }
-        .sidebar {
-            background: linear-gradient(135deg, #1565C0 0%, #0D47A1 100%);
-            color: white;
-        }
-        .layer-control {
-            background: rgba(255, 255, 255, 0.95);
-            backdrop-filter: blur(10px);
-            border-radius: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }
-        .tool-button {
-            transition: all 0.2s ease;
-            border-radius: 8px;
-        }
-        .tool-button:hover {
-            transform: translateY(-1px);
-            box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-        }
-        </style>
-        """)
-
         # Page header
         with ui.row().classes("w-full items-center justify-between p-4 sidebar"):
             with ui.column():
@@ -78,52 +353,86 @@ def create():
         """Create the left sidebar with controls."""
         ui.label("Kontrol Peta").classes("text-xl font-bold text-gray-800 mb-4")
 
-        # Layer controls
-        with ui.expansion("Layer Infrastruktur", icon="layers").classes("w-full mb-2"):
-            create_layer_controls()
+        # Layer controls; the returned refresh callback is handed to the
+        # upload section so a successful upload updates this page's controls
+        with ui.expansion("Layer Infrastruktur", icon="layers").classes(_FIELD_CLASSES):
+            refresh_layers = create_layer_controls()
 
         # Upload section
-        with ui.expansion("Unggah Layer", icon="cloud_upload").classes("w-full mb-2"):
-            create_upload_section()
+        with ui.expansion("Unggah Layer", icon="cloud_upload").classes(_FIELD_CLASSES):
+            create_upload_section(refresh_layers)
 
         # Measurement tools
-        with ui.expansion("Alat Ukur", icon="straighten").classes("w-full mb-2"):
+        with ui.expansion("Alat Ukur", icon="straighten").classes(_FIELD_CLASSES):
             create_measurement_tools()
 
         # Complaint section
-        with ui.expansion("Laporan Keluhan", icon="report_problem").classes("w-full mb-2"):
+        with ui.expansion("Laporan Keluhan", icon="report_problem").classes(_FIELD_CLASSES):
             create_complaint_section()
 
     def create_layer_controls():
-        """Create layer visibility controls."""
-        ui.label("Kontrol Visibilitas Layer").classes("text-sm font-medium text-gray-600 mb-2")
+        """Create layer visibility controls; returns this page's refresh callback."""
+        ui.label("Kontrol Visibilitas Layer").classes(_SECTION_LABEL_CLASSES)
 
         # Get all layers
         layers = GeospatialService.get_all_active_layers()
+        layers_by_id = {layer.id: layer for layer in layers}
+        layer_names = {layer.id: layer.name for layer in layers}
+
+        # One multi-select drives every layer. Toggling happens entirely on
+        # the client: the js_handler feeds the new selection straight into
+        # syncLayerVisibility, so no toggle round-trips through Python
+        visibility_select = (
+            ui.select(
+                options=layer_names,
+                multiple=True,
+                value=list(layer_names),
+                label="Layer aktif",
+            )
+            .classes(_FIELD_CLASSES)
+            .props("use-chips")
+            .on(
+                "update:model-value",
+                js_handler="(value) => window.syncLayerVisibility(value)",
+            )
+        )
 
-        for layer in layers:
-            with ui.row().classes("items-center gap-2 p-2"):
-                checkbox = ui.checkbox(layer.name, value=True).classes("text-sm")
-                checkbox.on_value_change(lambda e, layer_id=layer.id: toggle_layer(layer_id, e.value))
-
-                # Layer info button
-                ui.button(icon="info", on_click=lambda layer=layer: show_layer_info(layer)).props("size=sm flat round")
+        info_select = ui.select(
+            options=layer_names,
+            label="Info layer",
+            on_change=lambda e: show_layer_info(layers_by_id[e.value]) if e.value is not None else None,
+        ).classes("w-full")
+
+        def refresh_layers():
+            """Re-read the layer list and sync both the selects and the map."""
+            ui.notify("Memuat ulang layer...", type="info")
+            refreshed = GeospatialService.get_all_active_layers()
+            layers_by_id.clear()
+            layers_by_id.update({layer.id: layer for layer in refreshed})
+            names = {layer.id: layer.name for layer in refreshed}
+            visibility_select.set_options(names, value=list(names))
+            info_select.set_options(names)
+            # The client pulls the fresh payload from /layers.json.gz and
+            # rebuilds its Leaflet references to match
+            ui.run_javascript("refreshMapLayers();")
 
         # Refresh layers button
         ui.button("Refresh Layer", icon="refresh", on_click=refresh_layers).classes(
             "w-full mt-2 bg-blue-500 text-white"
         )
 
-    def create_upload_section():
+        return refresh_layers
+
+    def create_upload_section(refresh_layers):
         """Create file upload section."""
-        ui.label("Unggah File Geospasial").classes("text-sm font-medium text-gray-600 mb-2")
+        ui.label("Unggah File Geospasial").classes(_SECTION_LABEL_CLASSES)
 
         # Layer name input
-        layer_name_input = ui.input("Nama Layer", placeholder="Masukkan nama layer").classes("w-full mb-2")
+        layer_name_input = ui.input("Nama Layer", placeholder="Masukkan nama layer").classes(_FIELD_CLASSES)
 
         # Description input
         layer_desc_input = (
-            ui.textarea("Deskripsi", placeholder="Deskripsi opsional").classes("w-full mb-2").props("rows=2")
+            ui.textarea("Deskripsi", placeholder="Deskripsi opsional").classes(_FIELD_CLASSES).props("rows=2")
         )
 
         # Public visibility checkbox
@@ -132,7 +441,9 @@ def create():
         # File upload
         ui.upload(
             label="Pilih File (KML, KMZ, SHP)",
-            on_upload=lambda e: handle_file_upload(e, layer_name_input, layer_desc_input, public_checkbox),
+            on_upload=lambda e: handle_file_upload(
+                e, layer_name_input, layer_desc_input, public_checkbox, refresh_layers
+            ),
             auto_upload=True,
         ).classes("w-full").props('accept=".kml,.kmz,.shp"')
 
@@ -140,16 +451,16 @@ def create():
 
     def create_measurement_tools():
         """Create measurement tools section."""
-        ui.label("Alat Pengukuran").classes("text-sm font-medium text-gray-600 mb-2")
+        ui.label("Alat Pengukuran").classes(_SECTION_LABEL_CLASSES)
 
         with ui.column().classes("gap-2"):
-            ui.button("Ukur Jarak", icon="straighten", on_click=activate_distance_tool).classes("w-full tool-button")
-            ui.button("Ukur Luas", icon="crop_free", on_click=activate_area_tool).classes("w-full tool-button")
-            ui.button("Hapus Pengukuran", icon="clear", on_click=clear_measurements).classes("w-full tool-button")
+            ui.button("Ukur Jarak", icon="straighten", on_click=activate_distance_tool).classes(_TOOL_BUTTON_CLASSES)
+            ui.button("Ukur Luas", icon="crop_free", on_click=activate_area_tool).classes(_TOOL_BUTTON_CLASSES)
+            ui.button("Hapus Pengukuran", icon="clear", on_click=clear_measurements).classes(_TOOL_BUTTON_CLASSES)
 
     def create_complaint_section():
         """Create complaint submission section."""
-        ui.label("Laporkan Keluhan").classes("text-sm font-medium text-gray-600 mb-2")
+        ui.label("Laporkan Keluhan").classes(_SECTION_LABEL_CLASSES)
 
         with ui.column().classes("gap-2"):
             ui.button("Buat Laporan Baru", icon="add_circle", on_click=show_complaint_form).classes(
@@ -159,74 +470,19 @@ def create():
 
     def create_map_interface():
         """Create the main map interface using Leaflet."""
-        bounds = GeospatialService.get_west_lombok_bounds()
-        center_lat, center_lon = GeospatialService.get_default_map_center()
-
-        # Map HTML with Leaflet
-        # Map container div (without script tags)
-        map_html = '<div id="map" style="width: 100%; height: 80vh;" class="map-container"></div>'
-
-        # Add Leaflet CSS and JS
-        ui.add_head_html("""
-        <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css" />
-        <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
-        """)
+        # Serialize all active layers once at render time; toggles then mutate
+        # client-side references instead of round-tripping through Python.
+        # The payload lands inside a <script> block and layer names and
+        # geometry properties are user-supplied, so escape "<" (orjson does
+        # not) or an uploaded "</script>" would break out of script context
+        layers_payload = (
+            orjson.dumps(_serialize_layers(GeospatialService.get_all_active_layers())).decode().replace("<", "\\u003c")
+        )
 
-        ui.html(map_html).classes("w-full")
-
-        # Add map initialization script
-        ui.add_body_html(f"""
-        <script>
-            // Initialize Leaflet map
-            var map = L.map('map').setView([{center_lat}, {center_lon}], 10);
-            
-            // Add base layer
-            L.tileLayer('https://{{s}}.tile.openstreetmap.org/{{z}}/{{x}}/{{y}}.png', {{
-                attribution: '© OpenStreetMap contributors | SI-GADES Lombok Barat'
-            }}).addTo(map);
-            
-            // Set max bounds to West Lombok
-            var bounds = L.latLngBounds(
-                [{bounds["south"]}, {bounds["west"]}],
-                [{bounds["north"]}, {bounds["east"]}]
-            );
-            map.setMaxBounds(bounds);
-            map.fitBounds(bounds);
-            
-            // Global variables for tools
-            window.measurementLayers = L.layerGroup().addTo(map);
-            window.currentTool = null;
-            window.tempMarkers = [];
-            
-            // Add click handler for complaint location
-            map.on('click', function(e) {{
-                if (window.currentTool === 'complaint') {{
-                    window.complaintLocation = {{
-                        lat: e.latlng.lat,
-                        lng: e.latlng.lng
-                    }};
-                    
-                    // Clear existing temp markers
-                    window.tempMarkers.forEach(marker => map.removeLayer(marker));
-                    window.tempMarkers = [];
-                    
-                    // Add new marker
-                    var marker = L.marker([e.latlng.lat, e.latlng.lng])
-                        .addTo(map)
-                        .bindPopup('Lokasi keluhan dipilih');
-                    window.tempMarkers.push(marker);
-                }}
-            }});
-            
-            // Load initial layers
-            loadMapLayers();
-            
-            function loadMapLayers() {{
-                // This will be called from Python to load actual layer data
-                console.log('Loading map layers...');
-            }}
-        </script>
-        """)
+        # Container div and bootstrap script are prebuilt at module import;
+        # only the layer payload is substituted per request
+        ui.html(_MAP_CONTAINER_HTML).classes("w-full")
+        ui.add_body_html(_MAP_JS_TEMPLATE.substitute(layers_payload=layers_payload))
 
         # Map controls
         with ui.row().classes("gap-2 mt-2"):
@@ -234,13 +490,6 @@ def create():
             ui.button("Lokasi Saya", icon="my_location", on_click=locate_user).classes("tool-button")
 
     # Event handlers
-    def toggle_layer(layer_id: int, visible: bool):
-        """Toggle layer visibility."""
-        ui.run_javascript(f"""
-            console.log('Toggle layer {layer_id}: {visible}');
-            // Implementation would toggle actual map layer
-        """)
-
     def show_layer_info(layer):
         """Show layer information dialog."""
         with ui.dialog() as dialog, ui.card().classes("w-96"):
@@ -254,12 +503,7 @@ def create():
 
         dialog.open()
 
-    def refresh_layers():
-        """Refresh map layers."""
-        ui.notify("Memuat ulang layer...", type="info")
-        ui.run_javascript("loadMapLayers();")
-
-    def handle_file_upload(e: UploadEventArguments, name_input, desc_input, public_checkbox):
+    async def handle_file_upload(e: UploadEventArguments, name_input, desc_input, public_checkbox, refresh_layers):
         """Handle geospatial file upload."""
         try:
             if not name_input.value:
@@ -267,27 +511,36 @@ def create():
                 return
 
             filename = e.name
-            file_extension = filename.split(".")[-1].lower() if "." in filename else ""
+            file_extension = os.path.splitext(filename)[1][1:].lower()
 
-            # Validate file type
-            if file_extension not in ["kml", "kmz", "shp"]:
+            # Validate and resolve file type in one lookup
+            file_type = _FILE_TYPE_MAP.get(file_extension)
+            if file_type is None:
                 ui.notify("Format file tidak didukung. Gunakan KML, KMZ, atau SHP", type="negative")
                 return
 
-            # Determine file type
-            file_type = (
-                FileType.KML if file_extension == "kml" else FileType.KMZ if file_extension == "kmz" else FileType.SHP
-            )
-
-            # Save layer
-            layer = GeospatialService.save_user_layer(
-                file_content=e.content.read(),
-                filename=filename,
-                file_type=file_type,
-                name=name_input.value,
-                description=desc_input.value or "",
-                is_public=public_checkbox.value,
-            )
+            # Stream the upload to a temp file in 1MB chunks instead of reading
+            # it into memory, then hand the path to the service. The copy,
+            # parse, and hash all run in a worker thread so a large upload
+            # doesn't stall the event loop for other connected users.
+            tmp_path = None
+            try:
+                with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_extension}") as tmp:
+                    tmp_path = Path(tmp.name)
+                    await asyncio.to_thread(shutil.copyfileobj, e.content, tmp, 1 << 20)
+
+                layer = await asyncio.to_thread(
+                    GeospatialService.save_user_layer_from_path,
+                    source_path=tmp_path,
+                    filename=filename,
+                    file_type=file_type,
+                    name=name_input.value,
+                    description=desc_input.value or "",
+                    is_public=public_checkbox.value,
+                )
+            finally:
+                if tmp_path is not None:
+                    tmp_path.unlink(missing_ok=True)
 
             if layer:
                 ui.notify(f'Layer "{name_input.value}" berhasil diunggah!', type="positive")
@@ -301,25 +554,27 @@ def create():
                 ui.notify("Gagal mengunggah layer. Coba lagi.", type="negative")
 
         except Exception as error:
-            import logging
-
-            logging.error(f"File upload error: {str(error)}")
+            logger.exception(f"File upload error: {str(error)}")
             ui.notify(f"Error: {str(error)}", type="negative")
 
     def activate_distance_tool():
         """Activate distance measurement tool."""
         ui.notify("Klik dua titik di peta untuk mengukur jarak", type="info")
         ui.run_javascript("""
-            window.currentTool = 'distance';
-            document.body.style.cursor = 'crosshair';
+            window.ensureDrawPlugin(function () {
+                window.currentTool = 'distance';
+                document.body.style.cursor = 'crosshair';
+            });
         """)
 
     def activate_area_tool():
         """Activate area measurement tool."""
         ui.notify("Klik beberapa titik di peta untuk mengukur luas", type="info")
         ui.run_javascript("""
-            window.currentTool = 'area';
-            document.body.style.cursor = 'crosshair';
+            window.ensureDrawPlugin(function () {
+                window.currentTool = 'area';
+                document.body.style.cursor = 'crosshair';
+            });
         """)
 
     def clear_measurements():
@@ -337,13 +592,13 @@ def create():
         ui.run_javascript('window.currentTool = "complaint";')
 
         with ui.dialog() as dialog, ui.card().classes("w-96 max-h-96 overflow-auto"):
-            ui.label("Formulir Laporan Keluhan").classes("text-lg font-bold mb-4")
+            ui.label("Formulir Laporan Keluhan").classes(_DIALOG_TITLE_CLASSES)
 
             # Form fields
-            title_input = ui.input("Judul Keluhan", placeholder="Ringkasan masalah").classes("w-full mb-2")
+            title_input = ui.input("Judul Keluhan", placeholder="Ringkasan masalah").classes(_FIELD_CLASSES)
             desc_input = (
                 ui.textarea("Deskripsi Detail", placeholder="Jelaskan masalah secara detail")
-                .classes("w-full mb-2")
+                .classes(_FIELD_CLASSES)
                 .props("rows=4")
             )
             location_desc_input = ui.input("Deskripsi Lokasi", placeholder="Contoh: Depan kantor desa").classes(
@@ -351,15 +606,22 @@ def create():
             )
 
             # Optional contact info
-            ui.label("Informasi Kontak (Opsional)").classes("text-sm font-medium text-gray-600 mb-1")
-            name_input = ui.input("Nama Lengkap", placeholder="Nama pelapor").classes("w-full mb-2")
-            email_input = ui.input("Email", placeholder="email@example.com").classes("w-full mb-2")
-            phone_input = ui.input("No. Telepon", placeholder="08xxxxxxxxxx").classes("w-full mb-2")
+            ui.label("Informasi Kontak (Opsional)").classes(_SUBSECTION_LABEL_CLASSES)
+            name_input = ui.input("Nama Lengkap", placeholder="Nama pelapor").classes(_FIELD_CLASSES)
+            email_input = ui.input("Email", placeholder="email@example.com").classes(_FIELD_CLASSES)
+            phone_input = ui.input("No. Telepon", placeholder="08xxxxxxxxxx").classes(_FIELD_CLASSES)
 
             # Photo upload
-            ui.label("Lampiran Foto").classes("text-sm font-medium text-gray-600 mb-1")
+            ui.label("Lampiran Foto").classes(_SUBSECTION_LABEL_CLASSES)
             photo_upload = (
-                ui.upload(label="Pilih Foto (Max 5MB)", auto_upload=True, multiple=True)
+                # max_file_size rejects oversized files in the browser, before
+                # any bytes are transferred or buffered server-side
+                ui.upload(
+                    label="Pilih Foto (Max 5MB)",
+                    auto_upload=True,
+                    multiple=True,
+                    max_file_size=ComplaintService.MAX_PHOTO_SIZE,
+                )
                 .classes("w-full mb-4")
                 .props('accept="image/*"')
             )
@@ -403,30 +665,43 @@ def create():
             complaint_data = ComplaintCreate(
                 title=title_input.value,
                 description=desc_input.value,
-                latitude=Decimal(str(location["lat"])),
-                longitude=Decimal(str(location["lng"])),
+                latitude=location["lat"],
+                longitude=location["lng"],
                 location_description=location_desc_input.value or "",
                 submitter_name=name_input.value or None,
                 submitter_email=email_input.value or None,
                 submitter_phone=phone_input.value or None,
             )
 
-            complaint = ComplaintService.create_complaint(complaint_data)
+            # Run the blocking insert in a worker thread so the event loop
+            # keeps serving other users
+            complaint = await asyncio.to_thread(ComplaintService.create_complaint, complaint_data)
             if not complaint or complaint.id is None:
                 ui.notify("Gagal menyimpan laporan", type="negative")
                 return
 
             # Handle photo uploads if any
             if hasattr(photo_upload, "value") and photo_upload.value:
-                for i, file_info in enumerate(photo_upload.value):
+                photos = []
+                for file_info in photo_upload.value:
                     if hasattr(file_info, "content"):
-                        ComplaintService.add_photo_to_complaint(
-                            complaint.id,
-                            file_info.content.read(),
-                            file_info.name,
-                            file_info.type or "image/jpeg",
-                            display_order=i,
-                        )
+                        # Size comes from a seek, so rejected files are never
+                        # read into memory
+                        file_info.content.seek(0, 2)
+                        size = file_info.content.tell()
+                        file_info.content.seek(0)
+
+                        mime_type = file_info.type or "image/jpeg"
+                        if not ComplaintService.validate_photo(mime_type, size):
+                            ui.notify(f"Foto {file_info.name} dilewati (format/ukuran tidak valid)", type="warning")
+                            continue
+
+                        photos.append((file_info.content.read(), file_info.name, mime_type))
+
+                # One bulk call: disk writes fan out concurrently and all rows
+                # land in a single commit instead of one transaction per photo
+                if photos:
+                    await ComplaintService.add_photos_bulk(complaint.id, photos)
 
             dialog.close()
 
@@ -434,9 +709,7 @@ def create():
             await show_redirect_dialog(complaint.id)
 
         except Exception as e:
-            import logging
-
-            logging.error(f"Error submitting complaint: {str(e)}")
+            logger.exception(f"Error submitting complaint: {str(e)}")
             ui.notify(f"Error: {str(e)}", type="negative")
 
     async def show_redirect_dialog(complaint_id: int):
@@ -470,22 +743,30 @@ def create():
         dialog.close()
         ui.notify("Redirected to Lapor.go.id", type="info")
 
-    def show_recent_complaints():
+    async def show_recent_complaints():
         """Show recent complaints dialog."""
-        complaints = ComplaintService.get_recent_complaints(10)
+        # The dialog only renders four columns, so the slim dict query skips
+        # photo loading and ORM row hydration entirely
+        complaints = await asyncio.to_thread(ComplaintService.get_recent_complaints_fast, 10)
 
-        with ui.dialog() as dialog, ui.card().classes("w-full max-w-4xl max-h-96 overflow-auto"):
-            ui.label("Laporan Keluhan Terbaru").classes("text-lg font-bold mb-4")
+        with ui.dialog() as dialog, ui.card().classes("w-full max-w-4xl"):
+            ui.label("Laporan Keluhan Terbaru").classes(_DIALOG_TITLE_CLASSES)
 
             if not complaints:
                 ui.label("Belum ada laporan keluhan").classes("text-gray-500 text-center p-4")
             else:
-                for complaint in complaints:
-                    with ui.card().classes("mb-2 p-3"):
-                        ui.label(complaint.title).classes("font-bold")
-                        ui.label(f"Lokasi: {complaint.location_description}").classes("text-sm text-gray-600")
-                        ui.label(f"Status: {complaint.status}").classes("text-xs")
-                        ui.label(f"Waktu: {complaint.created_at}").classes("text-xs text-gray-500")
+                # One scrollable component hosting all rows instead of four
+                # NiceGUI labels per complaint; user content is escaped
+                rows = "".join(
+                    '<div class="mb-2 p-3" style="border: 1px solid #e5e7eb; border-radius: 6px;">'
+                    f'<div class="font-bold">{escape(complaint["title"])}</div>'
+                    f'<div class="text-sm text-gray-600">Lokasi: {escape(complaint["location_description"] or "")}</div>'
+                    f'<div class="text-xs">Status: {escape(complaint["status"])}</div>'
+                    f'<div class="text-xs text-gray-500">Waktu: {escape(complaint["created_at"])}</div>'
+                    "</div>"
+                    for complaint in complaints
+                )
+                ui.html(f'<div style="max-height: 300px; overflow-y: auto;">{rows}</div>').classes("w-full")
 
             ui.button("Tutup", on_click=dialog.close).classes("mt-4 bg-gray-500 text-white")
 
@@ -514,24 +795,24 @@ def create():
     def show_help_dialog():
         """Show help dialog."""
         with ui.dialog() as dialog, ui.card().classes("w-96 max-h-96 overflow-auto"):
-            ui.label("Bantuan SI-GADES").classes("text-lg font-bold mb-4")
+            ui.label("Bantuan SI-GADES").classes(_DIALOG_TITLE_CLASSES)
 
             with ui.column().classes("gap-2"):
                 ui.label("🗺️ Navigasi Peta").classes("font-medium")
-                ui.label("• Zoom dengan mouse wheel atau tombol +/-").classes("text-sm")
-                ui.label("• Drag untuk menggeser peta").classes("text-sm")
+                ui.label("• Zoom dengan mouse wheel atau tombol +/-").classes(_HINT_CLASSES)
+                ui.label("• Drag untuk menggeser peta").classes(_HINT_CLASSES)
 
                 ui.label("📊 Layer").classes("font-medium mt-4")
-                ui.label("• Centang/hilangkan centang untuk menampilkan layer").classes("text-sm")
-                ui.label("• Unggah file KML, KMZ, atau SHP untuk layer kustom").classes("text-sm")
+                ui.label("• Centang/hilangkan centang untuk menampilkan layer").classes(_HINT_CLASSES)
+                ui.label("• Unggah file KML, KMZ, atau SHP untuk layer kustom").classes(_HINT_CLASSES)
 
                 ui.label("📏 Pengukuran").classes("font-medium mt-4")
-                ui.label('• Klik "Ukur Jarak" lalu klik 2 titik di peta').classes("text-sm")
-                ui.label('• Klik "Ukur Luas" lalu klik beberapa titik untuk area').classes("text-sm")
+                ui.label('• Klik "Ukur Jarak" lalu klik 2 titik di peta').classes(_HINT_CLASSES)
+                ui.label('• Klik "Ukur Luas" lalu klik beberapa titik untuk area').classes(_HINT_CLASSES)
 
                 ui.label("📝 Laporan Keluhan").classes("font-medium mt-4")
-                ui.label('• Klik "Buat Laporan" lalu pilih lokasi di peta').classes("text-sm")
-                ui.label("• Isi formulir dan lampirkan foto jika perlu").classes("text-sm")
+                ui.label('• Klik "Buat Laporan" lalu pilih lokasi di peta').classes(_HINT_CLASSES)
+                ui.label("• Isi formulir dan lampirkan foto jika perlu").classes(_HINT_CLASSES)
 
             ui.button("Tutup", on_click=dialog.close).classes("mt-4 bg-blue-500 text-white")
 
@@ -540,7 +821,7 @@ def create():
     def show_about_dialog():
         """Show about dialog."""
         with ui.dialog() as dialog, ui.card().classes("w-96"):
-            ui.label("Tentang SI-GADES").classes("text-lg font-bold mb-4")
+            ui.label("Tentang SI-GADES").classes(_DIALOG_TITLE_CLASSES)
 
             ui.label("SI-GADES (Sistem Infrastruktur Geo Spasial Berbasis Desa)").classes("font-medium mb-2")
             ui.label("Aplikasi pemetaan infrastruktur desa di Kabupaten Lombok Barat, Nusa Tenggara Barat.").classes(
@@ -549,10 +830,10 @@ def create():
 
             ui.label("Fitur Utama:").classes("font-medium mb-2")
             with ui.column().classes("gap-1"):
-                ui.label("• Peta interaktif dengan layer infrastruktur").classes("text-sm")
-                ui.label("• Upload file geospasial (KML, KMZ, SHP)").classes("text-sm")
-                ui.label("• Alat pengukuran jarak dan luas").classes("text-sm")
-                ui.label("• Sistem laporan keluhan publik").classes("text-sm")
+                ui.label("• Peta interaktif dengan layer infrastruktur").classes(_HINT_CLASSES)
+                ui.label("• Upload file geospasial (KML, KMZ, SHP)").classes(_HINT_CLASSES)
+                ui.label("• Alat pengukuran jarak dan luas").classes(_HINT_CLASSES)
+                ui.label("• Sistem laporan keluhan publik").classes(_HINT_CLASSES)
 
             ui.label("Data dari Badan Informasi Geospasial (BIG)").classes("text-sm text-gray-600 mt-4")
 
@@ -1,9 +1,14 @@
+from sqlalchemy import Index, func, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import SQLModel, Field, Relationship, JSON, Column
 from datetime import datetime
 from typing import Optional, List, Dict, Any
-from decimal import Decimal
 from enum import Enum
 
+# JSONB on PostgreSQL (binary storage, no text reparse on read), generic JSON
+# elsewhere; the engine-level orjson hooks handle the Python-side conversion
+GeoJSONColumn = JSON().with_variant(JSONB(), "postgresql")
+
 
 class LayerType(str, Enum):
     """Types of infrastructure layers"""
@@ -41,12 +46,14 @@ class StaticLayer(SQLModel, table=True):
     layer_type: LayerType = Field(description="Type of infrastructure layer")
     description: str = Field(default="", max_length=1000)
     source: str = Field(default="BIG", max_length=100, description="Data source (e.g., BIG)")
-    geom_data: Dict[str, Any] = Field(default={}, sa_column=Column(JSON), description="GeoJSON data")
-    style_properties: Dict[str, Any] = Field(default={}, sa_column=Column(JSON), description="Map styling properties")
+    geom_data: Dict[str, Any] = Field(default={}, sa_column=Column(GeoJSONColumn), description="GeoJSON data")
+    style_properties: Dict[str, Any] = Field(
+        default={}, sa_column=Column(GeoJSONColumn), description="Map styling properties"
+    )
     is_active: bool = Field(default=True)
     display_order: int = Field(default=0, description="Layer display order")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, sa_column_kwargs={"server_default": func.now()})
+    updated_at: Optional[datetime] = Field(default=None, sa_column_kwargs={"server_default": func.now()})
 
 
 # User-uploaded geospatial layers
@@ -60,25 +67,43 @@ class UserLayer(SQLModel, table=True):
     original_filename: str = Field(max_length=255)
     file_path: str = Field(max_length=500, description="Path to stored file")
     file_size: int = Field(description="File size in bytes")
-    geom_data: Dict[str, Any] = Field(default={}, sa_column=Column(JSON), description="Converted GeoJSON data")
-    style_properties: Dict[str, Any] = Field(default={}, sa_column=Column(JSON), description="Map styling properties")
+    geom_data: Dict[str, Any] = Field(default={}, sa_column=Column(GeoJSONColumn), description="Converted GeoJSON data")
+    style_properties: Dict[str, Any] = Field(
+        default={}, sa_column=Column(GeoJSONColumn), description="Map styling properties"
+    )
     is_public: bool = Field(default=False, description="Whether layer is visible to other users")
     is_active: bool = Field(default=True)
     upload_ip: Optional[str] = Field(default=None, max_length=45, description="IP address of uploader")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, sa_column_kwargs={"server_default": func.now()})
 
 
 # Public complaints with geolocation
 class Complaint(SQLModel, table=True):
     __tablename__ = "complaints"  # type: ignore[assignment]
+    __table_args__ = (
+        Index("ix_complaints_latitude_longitude", "latitude", "longitude"),
+        # Matches the (created_at DESC, id DESC) keyset ordering of
+        # get_recent_complaints; scanned backwards it reads the newest rows
+        # without a sort
+        Index("ix_complaints_created_at_id", "created_at", "id"),
+        # Tiny partial index over the to-triage queue; the enum column stores
+        # member names, hence the upper-case literal
+        Index(
+            "ix_complaints_open",
+            "created_at",
+            postgresql_where=text("status = 'SUBMITTED'"),
+            sqlite_where=text("status = 'SUBMITTED'"),
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str = Field(max_length=200, description="Complaint title/subject")
     description: str = Field(max_length=2000, description="Detailed complaint description")
 
     # Geolocation data
-    latitude: Decimal = Field(decimal_places=8, description="Latitude coordinate")
-    longitude: Decimal = Field(decimal_places=8, description="Longitude coordinate")
+    latitude: float = Field(description="Latitude coordinate")
+    longitude: float = Field(description="Longitude coordinate")
+    geo_cell: int = Field(default=0, index=True, description="Grid-cell id for indexed bounding-box queries")
     location_description: str = Field(default="", max_length=500, description="Human-readable location description")
 
     # Contact information (optional)
@@ -91,10 +116,14 @@ class Complaint(SQLModel, table=True):
     submit_ip: Optional[str] = Field(default=None, max_length=45, description="IP address of submitter")
     facebook_redirected: bool = Field(default=False, description="Whether redirected to Facebook")
     lapor_redirected: bool = Field(default=False, description="Whether redirected to lapor.go.id")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, sa_column_kwargs={"server_default": func.now()})
 
-    # Relationships
-    photos: List["ComplaintPhoto"] = Relationship(back_populates="complaint")
+    # Relationships; photos load already sorted, so response building never
+    # re-sorts in Python
+    photos: List["ComplaintPhoto"] = Relationship(
+        back_populates="complaint",
+        sa_relationship_kwargs={"order_by": "[ComplaintPhoto.display_order, ComplaintPhoto.created_at]"},
+    )
 
 
 # Photos attached to complaints
@@ -107,9 +136,10 @@ class ComplaintPhoto(SQLModel, table=True):
     file_path: str = Field(max_length=500, description="Path to stored photo")
     file_size: int = Field(description="File size in bytes")
     mime_type: str = Field(max_length=100, description="MIME type (e.g., image/jpeg)")
+    content_sha256: str = Field(default="", max_length=64, index=True, description="SHA-256 of the photo content")
     caption: str = Field(default="", max_length=500, description="Optional photo caption")
     display_order: int = Field(default=0, description="Photo display order")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default=None, sa_column_kwargs={"server_default": func.now()})
 
     # Relationships
     complaint: Complaint = Relationship(back_populates="photos")
@@ -152,8 +182,8 @@ class UserLayerCreate(SQLModel, table=False):
 class ComplaintCreate(SQLModel, table=False):
     title: str = Field(max_length=200)
     description: str = Field(max_length=2000)
-    latitude: Decimal
-    longitude: Decimal
+    latitude: float
+    longitude: float
     location_description: str = Field(default="", max_length=500)
     submitter_name: Optional[str] = Field(default=None, max_length=100)
     submitter_email: Optional[str] = Field(default=None, max_length=255)
@@ -175,8 +205,8 @@ class ComplaintResponse(SQLModel, table=False):
     id: int
     title: str
     description: str
-    latitude: Decimal
-    longitude: Decimal
+    latitude: float
+    longitude: float
     location_description: str
     submitter_name: Optional[str]
     status: ComplaintStatus
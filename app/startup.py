@@ -8,5 +8,8 @@ def startup() -> None:
     create_tables()
     GeospatialService.seed_default_layers()
 
+    # Serialize and compress the seeded layers now, not on the first map load
+    mapping.warm_layer_cache()
+
     # Create mapping application routes
     mapping.create()
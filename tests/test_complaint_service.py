@@ -2,9 +2,14 @@
 
 import pytest
 from decimal import Decimal
-from app.complaint_service import ComplaintService
-from app.models import ComplaintCreate, ComplaintStatus
-from app.database import reset_db
+from pathlib import Path
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import raiseload, selectinload
+from sqlmodel import select
+
+from app.complaint_service import ComplaintService, _geo_cell, _geo_cell_ranges, _photos_for_complaints
+from app.models import Complaint, ComplaintCreate, ComplaintStatus
+from app.database import get_session, reset_db
 
 
 @pytest.fixture
@@ -39,8 +44,8 @@ class TestComplaintService:
         assert complaint is not None
         assert complaint.title == "Jalan rusak"
         assert complaint.description == "Jalan berlubang di depan pasar"
-        assert complaint.latitude == Decimal("-8.55")
-        assert complaint.longitude == Decimal("116.15")
+        assert complaint.latitude == pytest.approx(-8.55)
+        assert complaint.longitude == pytest.approx(116.15)
         assert complaint.location_description == "Depan pasar tradisional"
         assert complaint.status == ComplaintStatus.SUBMITTED
         assert complaint.submitter_name is None
@@ -110,6 +115,62 @@ class TestComplaintService:
         assert result.photos[0].caption == "Foto 1"
         assert result.photos[1].caption == "Foto 2"
 
+    def test_read_paths_raise_on_unloaded_relationship(self, new_db):
+        """Test that raiseload guards turn accidental lazy loads into errors."""
+        complaint_data = ComplaintCreate(
+            title="Guard test",
+            description="Lazy loads should raise",
+            latitude=Decimal("-8.55"),
+            longitude=Decimal("116.15"),
+        )
+
+        complaint = ComplaintService.create_complaint(complaint_data)
+        assert complaint is not None
+        assert complaint.id is not None
+
+        photo = ComplaintService.add_photo_to_complaint(complaint.id, b"fake content", "photo.jpg", "image/jpeg")
+        assert photo is not None
+
+        # Same loader options as the service read paths: photos are eager, everything else raises
+        with get_session() as session:
+            loaded = session.exec(
+                select(Complaint)
+                .options(selectinload(Complaint.photos), raiseload("*"))  # type: ignore[arg-type]
+                .where(Complaint.id == complaint.id)
+            ).one()
+
+            assert len(loaded.photos) == 1
+
+            with pytest.raises(InvalidRequestError):
+                _ = loaded.photos[0].complaint
+
+    def test_photos_for_complaints_batch(self, new_db):
+        """Test batched photo lookup keyed by complaint id."""
+        ids = []
+        for i in range(3):
+            complaint_data = ComplaintCreate(
+                title=f"Complaint {i + 1}",
+                description=f"Description {i + 1}",
+                latitude=Decimal("-8.55"),
+                longitude=Decimal("116.15"),
+            )
+            complaint = ComplaintService.create_complaint(complaint_data)
+            assert complaint is not None
+            assert complaint.id is not None
+            ids.append(complaint.id)
+
+        # Two photos for the first complaint, one for the second, none for the third
+        ComplaintService.add_photo_to_complaint(ids[0], b"content a", "a.jpg", "image/jpeg", display_order=1)
+        ComplaintService.add_photo_to_complaint(ids[0], b"content b", "b.jpg", "image/jpeg", display_order=0)
+        ComplaintService.add_photo_to_complaint(ids[1], b"content c", "c.jpg", "image/jpeg")
+
+        with get_session() as session:
+            by_id = _photos_for_complaints(session, ids)
+
+        assert set(by_id.keys()) == {ids[0], ids[1]}
+        assert [p.filename for p in by_id[ids[0]]] == ["b.jpg", "a.jpg"]  # display order
+        assert [p.filename for p in by_id[ids[1]]] == ["c.jpg"]
+
     def test_add_photo_invalid_type(self, new_db):
         """Test adding photo with invalid MIME type."""
         complaint_data = ComplaintCreate(
@@ -223,6 +284,107 @@ class TestComplaintService:
         success = ComplaintService.mark_redirected(999, "facebook")
         assert not success
 
+    async def test_add_photos_bulk(self, new_db):
+        """Test saving several photos in one commit, in display order."""
+        complaint_data = ComplaintCreate(
+            title="Test complaint",
+            description="Test description",
+            latitude=Decimal("-8.55"),
+            longitude=Decimal("116.15"),
+        )
+
+        complaint = ComplaintService.create_complaint(complaint_data)
+        assert complaint is not None
+        assert complaint.id is not None
+
+        photos = [
+            (b"fake image content 1", "photo1.jpg", "image/jpeg"),
+            (b"fake image content 2", "photo2.png", "image/png"),
+        ]
+        saved = await ComplaintService.add_photos_bulk(complaint.id, photos)
+
+        assert [photo.display_order for photo in saved] == [0, 1]
+        assert all(Path(photo.file_path).exists() for photo in saved)
+
+        result = ComplaintService.get_complaint(complaint.id)
+        assert result is not None
+        assert [photo.filename for photo in result.photos] == ["photo1.jpg", "photo2.png"]
+        assert result.photos[1].mime_type == "image/png"
+
+    async def test_add_photos_bulk_rejects_invalid_type(self, new_db):
+        """Test that one bad photo rejects the whole batch."""
+        complaint_data = ComplaintCreate(
+            title="Test complaint",
+            description="Test description",
+            latitude=Decimal("-8.55"),
+            longitude=Decimal("116.15"),
+        )
+
+        complaint = ComplaintService.create_complaint(complaint_data)
+        assert complaint is not None
+        assert complaint.id is not None
+
+        photos = [
+            (b"fake image content", "photo.jpg", "image/jpeg"),
+            (b"not an image", "document.txt", "text/plain"),
+        ]
+        saved = await ComplaintService.add_photos_bulk(complaint.id, photos)
+
+        assert saved == []
+        result = ComplaintService.get_complaint(complaint.id)
+        assert result is not None
+        assert result.photos == []
+
+    def test_finalize_photos_and_redirect(self, new_db):
+        """Test attaching photos and redirecting in a single transaction."""
+        complaint_data = ComplaintCreate(
+            title="Test complaint",
+            description="Test description",
+            latitude=Decimal("-8.55"),
+            longitude=Decimal("116.15"),
+        )
+
+        complaint = ComplaintService.create_complaint(complaint_data)
+        assert complaint is not None
+        assert complaint.id is not None
+
+        success = ComplaintService.finalize(
+            complaint.id, [(b"fake image content", "photo.jpg", "image/jpeg")], "facebook"
+        )
+        assert success
+
+        result = ComplaintService.get_complaint(complaint.id)
+        assert result is not None
+        assert len(result.photos) == 1
+        assert result.status == ComplaintStatus.REDIRECTED
+
+        # Second platform completes the complaint; no further photos needed
+        assert ComplaintService.finalize(complaint.id, [], "lapor")
+        result = ComplaintService.get_complaint(complaint.id)
+        assert result is not None
+        assert result.status == ComplaintStatus.COMPLETED
+
+    def test_finalize_invalid_photo_leaves_status(self, new_db):
+        """Test that a rejected photo aborts finalize without a status change."""
+        complaint_data = ComplaintCreate(
+            title="Test complaint",
+            description="Test description",
+            latitude=Decimal("-8.55"),
+            longitude=Decimal("116.15"),
+        )
+
+        complaint = ComplaintService.create_complaint(complaint_data)
+        assert complaint is not None
+        assert complaint.id is not None
+
+        success = ComplaintService.finalize(complaint.id, [(b"not an image", "document.txt", "text/plain")], "facebook")
+        assert not success
+
+        result = ComplaintService.get_complaint(complaint.id)
+        assert result is not None
+        assert result.photos == []
+        assert result.status == ComplaintStatus.SUBMITTED
+
     def test_get_recent_complaints_empty(self, new_db):
         """Test getting recent complaints when none exist."""
         complaints = ComplaintService.get_recent_complaints()
@@ -230,15 +392,19 @@ class TestComplaintService:
 
     def test_get_recent_complaints_with_data(self, new_db):
         """Test getting recent complaints with data."""
-        # Create multiple complaints
-        for i in range(5):
-            complaint_data = ComplaintCreate(
-                title=f"Complaint {i + 1}",
-                description=f"Description {i + 1}",
-                latitude=Decimal("-8.55"),
-                longitude=Decimal("116.15"),
-            )
-            ComplaintService.create_complaint(complaint_data)
+        # Create multiple complaints in one bulk insert
+        inserted = ComplaintService.create_complaints_bulk(
+            [
+                ComplaintCreate(
+                    title=f"Complaint {i + 1}",
+                    description=f"Description {i + 1}",
+                    latitude=Decimal("-8.55"),
+                    longitude=Decimal("116.15"),
+                )
+                for i in range(5)
+            ]
+        )
+        assert inserted == 5
 
         complaints = ComplaintService.get_recent_complaints(3)
 
@@ -287,6 +453,20 @@ class TestComplaintService:
 
         assert complaints == []
 
+    def test_geo_cell_ranges_cover_bbox(self):
+        """Test that grid-cell ranges cover every point of a bounding box."""
+        south, west, north, east = -8.8, 115.9, -8.3, 116.4
+
+        ranges = _geo_cell_ranges(south, west, north, east)
+
+        # Corners and center all fall inside some covering range
+        for lat, lon in [(south, west), (north, east), (-8.55, 116.15)]:
+            cell = _geo_cell(lat, lon)
+            assert any(low <= cell <= high for low, high in ranges)
+
+        # Points outside the box are not covered
+        assert not any(low <= _geo_cell(-8.0, 117.0) <= high for low, high in ranges)
+
     def test_allowed_photo_types(self):
         """Test that allowed photo types are properly defined."""
         allowed_types = ComplaintService.ALLOWED_PHOTO_TYPES
@@ -1,7 +1,7 @@
 """Tests for geospatial service functionality."""
 
 import pytest
-from app.geo_service import GeospatialService
+from app.geo_service import GeospatialService, _parse_coordinates
 from app.models import FileType, LayerType
 from app.database import reset_db
 
@@ -67,6 +67,15 @@ class TestGeospatialService:
         assert not GeospatialService.validate_coordinates(0.0, 0.0)
         assert not GeospatialService.validate_coordinates(-90.0, -180.0)
 
+    def test_validate_coordinates_batch(self):
+        """Test vectorized coordinate validation against scalar results."""
+        lats = [-8.55, -7.0, -9.5, -8.5, 0.0]
+        lons = [116.15, 116.0, 116.0, 115.0, 0.0]
+
+        mask = GeospatialService.validate_coordinates_batch(lats, lons)
+
+        assert mask.tolist() == [GeospatialService.validate_coordinates(lat, lon) for lat, lon in zip(lats, lons)]
+
     def test_process_kml_file(self):
         """Test KML file processing."""
         kml_content = b'<?xml version="1.0" encoding="UTF-8"?><kml></kml>'
@@ -81,6 +90,64 @@ class TestGeospatialService:
         assert result["metadata"]["format"] == "kml"
         assert result["metadata"]["processed"]
 
+    def test_process_kml_file_placemarks(self):
+        """Test that Placemarks are parsed into GeoJSON features."""
+        kml_content = b"""<?xml version="1.0" encoding="UTF-8"?>
+        <kml xmlns="http://www.opengis.net/kml/2.2">
+          <Document>
+            <Placemark>
+              <name>Kantor Desa</name>
+              <Point><coordinates>116.15,-8.55,0</coordinates></Point>
+            </Placemark>
+            <Placemark>
+              <name>Jalan Kabupaten</name>
+              <LineString><coordinates>116.1,-8.5 116.2,-8.6</coordinates></LineString>
+            </Placemark>
+          </Document>
+        </kml>"""
+
+        result = GeospatialService.process_kml_file(kml_content, "desa.kml")
+
+        assert len(result["features"]) == 2
+        point, line = result["features"]
+        assert point["geometry"] == {"type": "Point", "coordinates": [116.15, -8.55]}
+        assert point["properties"]["name"] == "Kantor Desa"
+        assert line["geometry"]["type"] == "LineString"
+        assert line["geometry"]["coordinates"] == [[116.1, -8.5], [116.2, -8.6]]
+
+    def test_process_many_preserves_order(self):
+        """Test concurrent processing returns results in input order."""
+        kml_content = b"""<?xml version="1.0" encoding="UTF-8"?>
+        <kml xmlns="http://www.opengis.net/kml/2.2">
+          <Placemark><Point><coordinates>116.15,-8.55</coordinates></Point></Placemark>
+        </kml>"""
+
+        results = GeospatialService.process_many(
+            [
+                (kml_content, "a.kml", FileType.KML),
+                (b"", "b.shp", FileType.SHP),
+                (kml_content, "c.kml", FileType.KML),
+            ]
+        )
+
+        assert [r["metadata"]["source_file"] for r in results] == ["a.kml", "b.shp", "c.kml"]
+        assert len(results[0]["features"]) == 1
+        assert results[1]["metadata"]["format"] == "shapefile"
+        assert GeospatialService.process_many([]) == []
+
+    def test_parse_coordinates_mixed_widths(self):
+        """Test coordinate parsing with and without altitude components."""
+        # Uniform triples take the bulk NumPy path
+        assert _parse_coordinates("116.1,-8.5,0 116.2,-8.6,0") == [[116.1, -8.5], [116.2, -8.6]]
+
+        # Ragged blocks fall back to per-tuple parsing, skipping bad tuples
+        assert _parse_coordinates("116.1,-8.5 116.2,-8.6,10 bogus 116.3") == [[116.1, -8.5], [116.2, -8.6]]
+        assert _parse_coordinates("") == []
+
+        # Uniform comma counts with missing floats (trailing commas) must
+        # also degrade to the fallback rather than raise
+        assert _parse_coordinates("116.1,-8.5, 116.2,-8.6,") == [[116.1, -8.5], [116.2, -8.6]]
+
     def test_process_kml_file_invalid(self):
         """Test KML file processing with invalid content."""
         invalid_content = b"not valid xml content"
@@ -126,6 +193,72 @@ class TestGeospatialService:
             assert 0 <= style["fillOpacity"] <= 1
             assert style["weight"] > 0
 
+    def test_simplify_line_drops_collinear_points(self):
+        """Test Douglas-Peucker keeps corners and drops near-collinear vertices."""
+        coordinates = [[0.0, 0.0], [1.0, 0.001], [2.0, 0.0], [2.0, 1.0], [2.0, 2.0]]
+
+        simplified = GeospatialService.simplify_line(coordinates, tolerance=0.01)
+
+        # The near-collinear vertices go; the corner at (2, 0) stays
+        assert simplified.tolist() == [[0.0, 0.0], [2.0, 0.0], [2.0, 2.0]]
+
+    def test_simplify_line_respects_tolerance(self):
+        """Test that vertices beyond the tolerance are kept."""
+        coordinates = [[0.0, 0.0], [1.0, 0.5], [2.0, 0.0]]
+
+        assert len(GeospatialService.simplify_line(coordinates, tolerance=0.1)) == 3
+        assert len(GeospatialService.simplify_line(coordinates, tolerance=1.0)) == 2
+
+    def test_simplify_feature_collection(self):
+        """Test simplification of a GeoJSON FeatureCollection."""
+        geojson = {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "geometry": {
+                        "type": "LineString",
+                        "coordinates": [[0.0, 0.0], [1.0, 0.0], [2.0, 0.0], [2.0, 2.0]],
+                    },
+                    "properties": {"name": "jalan"},
+                },
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [116.15, -8.55]},
+                    "properties": {},
+                },
+            ],
+        }
+
+        result = GeospatialService.simplify_feature_collection(geojson, tolerance=0.01)
+
+        assert result["features"][0]["geometry"]["coordinates"] == [[0.0, 0.0], [2.0, 0.0], [2.0, 2.0]]
+        assert result["features"][0]["properties"] == {"name": "jalan"}
+        # Points pass through untouched
+        assert result["features"][1]["geometry"]["coordinates"] == [116.15, -8.55]
+
+    def test_extract_coordinate_arrays(self):
+        """Test flattening a FeatureCollection into lon/lat columns."""
+        geojson = {
+            "type": "FeatureCollection",
+            "features": [
+                {"type": "Feature", "geometry": {"type": "Point", "coordinates": [116.15, -8.55]}, "properties": {}},
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "LineString", "coordinates": [[116.1, -8.5], [116.2, -8.6]]},
+                    "properties": {},
+                },
+            ],
+        }
+
+        xs, ys = GeospatialService.extract_coordinate_arrays(geojson)
+
+        assert xs.tolist() == [116.15, 116.1, 116.2]
+        assert ys.tolist() == [-8.55, -8.5, -8.6]
+
+        # The columns feed directly into the batch bounds check
+        assert GeospatialService.validate_coordinates_batch(ys, xs).all()
+
     def test_calculate_area_triangle(self):
         """Test area calculation for a simple triangle."""
         # Simple triangle coordinates